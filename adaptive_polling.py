@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# adaptive_polling.py - CONSULTA ADAPTATIVA PER ESTACIÓ
+# La XEMA publica un període cada 30 minuts, però el disparador passa cada
+# 5 minuts (o cada minut en mode dimoni): la majoria de descàrregues tornen
+# l'últim període que ja teníem. Per cada estació guardem el final de
+# l'últim període vist i el retard típic de publicació, i només tornem a
+# consultar quan toca un període nou:
+#   - abans de l'hora prevista (final + 30 min + retard): no es consulta
+#   - al voltant de l'hora prevista: cada TIGHT_INTERVAL segons
+#   - si la pàgina segueix sense canvis: espera exponencial fins a MAX_BACKOFF
+#   - si hi ha errors: espera exponencial a partir de poll_minutes del registre
+# L'estat es guarda a data/polling_state.json. A GitHub Actions el workflow
+# el conserva entre execucions (actions/cache, amb la resta de data/); sense
+# això cada execució començaria de zero i totes les estacions tocarien.
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import period_index
+
+STATE_FILE = os.path.join('data', 'polling_state.json')
+
+# Cadència de publicació de la XEMA
+PERIOD = timedelta(minutes=30)
+
+# Retard de publicació suposat mentre no tenim mostres (segons)
+DEFAULT_LAG = 600
+
+# Comencem a consultar aquests segons abans de l'hora prevista
+LEAD = 60
+
+# Interval de consulta al voltant de l'hora prevista (segons)
+TIGHT_INTERVAL = 60
+
+# Consultes seguides sense canvis abans de començar a espaiar-les
+TIGHT_POLLS = 3
+
+# Espera màxima entre consultes d'una estació (segons)
+MAX_BACKOFF = 1800
+
+# Mostres de retard que es guarden per estació
+LAG_SAMPLES = 12
+
+# Interval per defecte si l'estació no en té al registre (minuts)
+DEFAULT_POLL_MINUTES = 5
+
+
+def period_end(periode, now):
+    """Final (UTC) d'un període 'HH:MM - HH:MM' en hora TU de la pàgina del dia, o None"""
+    slot = period_index.parse(periode)
+    if slot is None:
+        return None
+    # '23:30 - 00:00' (índex 47) acaba a mitjanit
+    day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    end = day + timedelta(minutes=period_index.end_minutes(slot))
+    # Just després de mitjanit la pàgina encara pot ser la del dia anterior
+    if end > now + PERIOD:
+        end -= timedelta(days=1)
+    return end
+
+
+def latest_period(rows):
+    """Text del període de la darrera fila de dades (files de la instantània), o None"""
+    for cells in reversed(rows or []):
+        if cells and period_index.parse(cells[0]) is not None:
+            return cells[0]
+    return None
+
+
+def _parse_time(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _iso(value):
+    return value.isoformat(timespec='seconds')
+
+
+class PollingState:
+    """Estat de consulta de totes les estacions (final de període, retards, esperes)"""
+
+    def __init__(self, filename=STATE_FILE):
+        self.filename = filename
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                self.stations = json.load(f).get('stations', {})
+        except (OSError, ValueError):
+            self.stations = {}
+
+    def typical_lag(self, code):
+        """Retard típic (mediana, en segons) entre el final d'un període i la seva publicació"""
+        lags = self.stations.get(code, {}).get('lags')
+        if not lags:
+            return DEFAULT_LAG
+        import statistics
+        return statistics.median(lags)
+
+    def next_poll(self, code):
+        """Propera hora de consulta de l'estació (o None si no en sabem res)"""
+        return _parse_time(self.stations.get(code, {}).get('next_poll'))
+
+    def is_due(self, station, now=None):
+        """Cal consultar l'estació ara?"""
+        now = now or datetime.now(timezone.utc)
+        next_poll = self.next_poll(station['code'])
+        return next_poll is None or next_poll <= now
+
+    def split(self, stations, now=None):
+        """Separa les estacions en (a consultar, a esperar)"""
+        now = now or datetime.now(timezone.utc)
+        due, waiting = [], []
+        for station in stations:
+            (due if self.is_due(station, now) else waiting).append(station)
+        return due, waiting
+
+    def record(self, station, periode=None, now=None, error=False):
+        """
+        Registra el resultat d'una consulta i planifica la següent
+
+        `periode` és el text de l'últim període de la pàgina (hora TU). Sense
+        `periode` ni error, la consulta es compta com a pàgina sense canvis.
+        """
+        now = now or datetime.now(timezone.utc)
+        state = self.stations.setdefault(station['code'], {})
+        previous_end = _parse_time(state.get('period_end'))
+        last_poll = _parse_time(state.get('last_poll'))
+        end = period_end(periode, now) if periode else None
+        state['last_poll'] = _iso(now)
+
+        if error:
+            state['failures'] = state.get('failures', 0) + 1
+            base = station.get('poll_minutes', DEFAULT_POLL_MINUTES) * 60
+            wait = min(base * 2 ** (state['failures'] - 1), MAX_BACKOFF)
+            state['next_poll'] = _iso(now + timedelta(seconds=wait))
+            return False
+        state['failures'] = 0
+
+        if end is not None and (previous_end is None or end > previous_end):
+            # Període nou. Si és el següent al que ja teníem i l'havíem
+            # consultat després que acabés, el temps fins ara és el retard
+            # de publicació (amb un error com a molt d'un interval de consulta)
+            if (previous_end is not None and end - previous_end == PERIOD
+                    and last_poll is not None and last_poll >= end):
+                lags = state.get('lags', [])
+                lags.append(round((now - end).total_seconds()))
+                state['lags'] = lags[-LAG_SAMPLES:]
+            state['period_end'] = _iso(end)
+            state['unchanged'] = 0
+            expected = end + PERIOD + timedelta(seconds=self.typical_lag(station['code']))
+            state['next_poll'] = _iso(max(expected - timedelta(seconds=LEAD),
+                                          now + timedelta(seconds=TIGHT_INTERVAL)))
+            return True
+
+        # Pàgina sense període nou
+        state['unchanged'] = state.get('unchanged', 0) + 1
+        end = end or previous_end
+        if end is None:
+            wait = station.get('poll_minutes', DEFAULT_POLL_MINUTES) * 60
+            state['next_poll'] = _iso(now + timedelta(seconds=wait))
+            return False
+
+        expected = end + PERIOD + timedelta(seconds=self.typical_lag(station['code']))
+        if now < expected - timedelta(seconds=LEAD):
+            state['next_poll'] = _iso(expected - timedelta(seconds=LEAD))
+        else:
+            # Ja tocava: consultes seguides i després cada cop més espaiades
+            overdue = max(0, state['unchanged'] - TIGHT_POLLS)
+            wait = min(TIGHT_INTERVAL * 2 ** overdue, MAX_BACKOFF)
+            state['next_poll'] = _iso(now + timedelta(seconds=wait))
+        return False
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.filename) or '.', exist_ok=True)
+        tmp = f"{self.filename}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'stations': self.stations}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.filename)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# artifacts.py - ESCRIPTURA DELS FITXERS DE SORTIDA (RSS, HTML, JSON)
+# Cada sortida es compara (SHA-256) amb el que ja hi ha al disc:
+#   - si és igual, no s'escriu (menys E/S, menys diferències a gh-pages i
+#     les caches dels visitants continuen sent vàlides)
+#   - si canvia, s'escriu a un fitxer temporal i es canvia de nom amb
+#     os.replace, de manera que el lector (ticker OBS, navegador) mai veu
+#     un fitxer a mig escriure
+# L'escriptor porta un manifest de tot el que s'ha escrit durant el procés
+# (canviat o no), que el pipeline mostra després de cada etapa.
+
+import hashlib
+import json
+import os
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class ArtifactWriter:
+    """Escriptor atòmic que només escriu si el contingut canvia"""
+
+    def __init__(self):
+        # {camí: {'sha256', 'bytes', 'changed'}} de les escriptures fetes
+        self.manifest = {}
+        # {camí: (mtime_ns, mida, sha256)}: evita rellegir fitxers ja coneguts
+        self._known = {}
+
+    def file_hash(self, path, size=None):
+        """SHA-256 d'un fitxer del disc, o None si no existeix (o no fa `size` bytes)"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if size is not None and stat.st_size != size:
+            return None
+        known = self._known.get(path)
+        if known and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            return known[2]
+        with open(path, 'rb') as f:
+            digest = content_hash(f.read())
+        self._known[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def write_bytes(self, path, data):
+        """Escriu `data` a `path` si canvia; retorna True si s'ha escrit"""
+        digest = content_hash(data)
+        changed = self.file_hash(path, len(data)) != digest
+        if changed:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+            stat = os.stat(path)
+            self._known[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        self.manifest[path] = {'sha256': digest, 'bytes': len(data), 'changed': changed}
+        return changed
+
+    def write_text(self, path, text, encoding='utf-8'):
+        return self.write_bytes(path, text.encode(encoding))
+
+    def write_json(self, path, data, **kwargs):
+        """json.dump a `path` (mateixos arguments) si el resultat canvia"""
+        return self.write_text(path, json.dumps(data, **kwargs))
+
+    def changed(self):
+        return [path for path, entry in self.manifest.items() if entry['changed']]
+
+    def unchanged(self):
+        return [path for path, entry in self.manifest.items() if not entry['changed']]
+
+    def reset(self):
+        """Buida el manifest (p. ex. abans de cada etapa del pipeline)"""
+        self.manifest = {}
+
+
+# Escriptor compartit per tots els scripts del procés
+WRITER = ArtifactWriter()
+
+
+def write_text(path, text, encoding='utf-8'):
+    return WRITER.write_text(path, text, encoding)
+
+
+def write_json(path, data, **kwargs):
+    return WRITER.write_json(path, data, **kwargs)
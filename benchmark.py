@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# benchmark.py - MESURES DE RENDIMENT
+# Per a execucions curtes (cada 5 minuts) l'arrencada de l'intèrpret i les
+# importacions són una part important del temps total. Aquest script mesura,
+# per a cada punt d'entrada, el temps d'arrencada i el temps d'importació
+# (python -X importtime), i mostra els mòduls que més costen.
+#
+# Ús:
+#   python benchmark.py [--runs 5] [--top 10] [--output bench_output.txt]
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Punts d'entrada que es mesuren
+ENTRY_MODULES = ('pipeline', 'generate_meteo_rss', 'daily_weather_scraper', 'generate_fullscreen_html')
+
+
+def _run_python(args):
+    return subprocess.run([sys.executable, *args], cwd=REPO_DIR,
+                          capture_output=True, text=True, check=True)
+
+
+def startup_time(module, runs=5):
+    """Mediana del temps de paret (ms) de `python -c 'import module'`"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        _run_python(['-c', f'import {module}'])
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def parse_importtime(stderr):
+    """Llegeix la sortida de -X importtime: llista de (mòdul, propi µs, acumulat µs, nivell)"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        level = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), level))
+    return entries
+
+
+def import_report(module, top=10):
+    """Temps d'importació d'un mòdul i els mòduls amb més temps propi"""
+    result = _run_python(['-X', 'importtime', '-c', f'import {module}'])
+    entries = parse_importtime(result.stderr)
+    total = sum(cumulative for _, _, cumulative, level in entries if level == 0)
+    heaviest = sorted(entries, key=lambda e: e[1], reverse=True)[:top]
+    return {
+        'module': module,
+        'total_ms': total / 1000,
+        'modules': len(entries),
+        'heaviest': [(name, self_us / 1000, cumulative_us / 1000) for name, self_us, cumulative_us, _ in heaviest],
+    }
+
+
+def format_report(reports, baseline_ms=None):
+    lines = ["=" * 60, "⏱️  ARRENCADA I IMPORTACIONS", "=" * 60]
+    for report in reports:
+        lines.append(f"\n📦 {report['module']}: arrencada {report['startup_ms']:.1f} ms | "
+                     f"importacions {report['total_ms']:.1f} ms ({report['modules']} mòduls)")
+        for name, self_ms, cumulative_ms in report['heaviest']:
+            lines.append(f"   • {name:<40} {self_ms:7.2f} ms propi | {cumulative_ms:7.2f} ms acumulat")
+    if baseline_ms is not None:
+        lines.append(f"\n🐍 Intèrpret buit: {baseline_ms:.1f} ms")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesura l'arrencada i les importacions dels scripts")
+    parser.add_argument('--runs', type=int, default=5, help="execucions per mesurar l'arrencada")
+    parser.add_argument('--top', type=int, default=10, help="mòduls més lents a mostrar")
+    parser.add_argument('--output', help="fitxer on guardar també l'informe")
+    args = parser.parse_args(argv)
+
+    baseline = startup_time('sys', args.runs)
+    reports = []
+    for module in ENTRY_MODULES:
+        report = import_report(module, args.top)
+        report['startup_ms'] = startup_time(module, args.runs)
+        reports.append(report)
+
+    text = format_report(reports, baseline)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    return reports
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# columnar_archive.py - ARXIU COLUMNAR BINARI (float32, memòria mapada)
+# Per a consultes de rangs llargs (estadístiques de 7 i 30 dies, pàgines
+# d'històric amb moltes estacions) sense parsejar JSON ni CSV:
+#   data/archive/XJ/2026-10/tm.f32   una columna per camp, estació i mes
+#   data/archive/XJ/2026-10/meta.json
+# Cada columna és un vector float32 de mida fixa (dies del mes × 48
+# períodes, NaN on falta la dada). L'índex de temps és la mateixa posició:
+# (dia - 1) × 48 + índex del període (period_index), en hora UTC; meta.json
+# en guarda l'inici i el pas. Els lectors mapen el fitxer en memòria i
+# reben vistes NumPy (o una concatenació si el rang passa de mes).
+# A GitHub Actions data/archive/ es conserva igual que observations.sqlite:
+# actions/cache entre execucions i la branca data-archive a llarg termini.
+#
+# Ús:
+#   python columnar_archive.py import [data/weather_daily_*.json]
+#   python columnar_archive.py stats XJ tm --days 7 30
+
+import argparse
+import calendar
+import glob
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+import period_index
+import xema_schema
+
+ARCHIVE_DIR = os.path.join('data', 'archive')
+
+DTYPE = np.dtype('<f4')
+SLOTS = period_index.SLOTS
+FIELDS = xema_schema.FIELDS
+
+EPOCH = date(1970, 1, 1)
+
+# {camí: (mtime_ns, memmap)} de les columnes obertes per llegir
+_open_columns = {}
+MAX_OPEN_COLUMNS = 256
+
+
+def _month_key(day):
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def _month_length(day):
+    return calendar.monthrange(day.year, day.month)[1] * SLOTS
+
+
+def column_path(station, month, field, root=ARCHIVE_DIR):
+    return os.path.join(root, station, month, f"{field}.f32")
+
+
+def _to_date(value):
+    if isinstance(value, datetime):
+        return (value.astimezone(timezone.utc) if value.tzinfo else value).date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def slot_number(value):
+    """Posició absoluta (períodes de 30 min des de 1970, UTC) d'una data o datetime"""
+    day = _to_date(value)
+    slot = 0
+    if isinstance(value, datetime):
+        utc = value.astimezone(timezone.utc) if value.tzinfo else value
+        slot = utc.hour * 2 + utc.minute // 30
+    return (day - EPOCH).days * SLOTS + slot
+
+
+# ---------------------------------------------------------------------------
+# Escriptura
+# ---------------------------------------------------------------------------
+
+def _create_column(path, length):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    np.full(length, np.nan, dtype=DTYPE).tofile(tmp)
+    os.replace(tmp, path)
+
+
+def _write_meta(directory, station, day):
+    path = os.path.join(directory, 'meta.json')
+    if os.path.exists(path):
+        return
+    first = day.replace(day=1)
+    meta = {
+        'station': station,
+        'month': _month_key(day),
+        'start': f"{first.isoformat()}T00:00:00Z",
+        'step_minutes': period_index.SLOT_MINUTES,
+        'slots_per_day': SLOTS,
+        'days': calendar.monthrange(day.year, day.month)[1],
+        'dtype': DTYPE.str,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+def write_day(station, day, slots, columns, root=ARCHIVE_DIR):
+    """
+    Escriu un dia d'una estació: `slots` són els índexs 0-47 i `columns`
+    {camp: valors alineats amb els índexs} (NaN on falta)
+
+    Les columnes es creen la primera vegada que tenen alguna dada.
+    Retorna els camps escrits.
+    """
+    day = _to_date(day)
+    month = _month_key(day)
+    length = _month_length(day)
+    offset = (day.day - 1) * SLOTS
+    slots = np.asarray(slots, dtype=np.intp)
+
+    written = []
+    for field, values in columns.items():
+        values = np.asarray(values, dtype=np.float64)
+        path = column_path(station, month, field, root)
+        if not os.path.exists(path):
+            if np.all(np.isnan(values)):
+                continue
+            _create_column(path, length)
+        row = np.full(SLOTS, np.nan, dtype=DTYPE)
+        row[slots] = values
+        column = np.memmap(path, dtype=DTYPE, mode='r+', shape=(length,))
+        column[offset:offset + SLOTS] = row
+        column.flush()
+        del column
+        written.append(field)
+    if written:
+        _write_meta(os.path.dirname(column_path(station, month, written[0], root)), station, day)
+    return written
+
+
+def write_station_day(station, periods, root=ARCHIVE_DIR):
+    """Escriu els períodes d'un StationDay (o llista de diccionaris del resum diari)"""
+    if not periods:
+        return []
+    if hasattr(periods, 'columns'):
+        slots = np.frombuffer(periods.slots, dtype=np.int8)
+        columns = {field: np.frombuffer(column, dtype=np.float64)
+                   for field, column in periods.columns.items()}
+        return write_day(station, periods.date, slots, columns, root)
+
+    rows = [(period_index.parse(p.get('period')), p) for p in periods]
+    rows = [(slot, p) for slot, p in rows if slot is not None]
+    fields = [f for f in FIELDS if any(f in p for _, p in rows)]
+    columns = {f: [np.nan if p.get(f) is None else p[f] for _, p in rows] for f in fields}
+    return write_day(station, periods[0]['date'], [slot for slot, _ in rows], columns, root)
+
+
+# ---------------------------------------------------------------------------
+# Lectura
+# ---------------------------------------------------------------------------
+
+def _column(station, month, field, root):
+    """Columna mapada en memòria (només lectura), o None si no existeix"""
+    path = column_path(station, month, field, root)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    cached = _open_columns.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    column = np.memmap(path, dtype=DTYPE, mode='r')
+    if len(_open_columns) >= MAX_OPEN_COLUMNS:
+        _open_columns.clear()
+    _open_columns[path] = (mtime, column)
+    return column
+
+
+def read_range(station, field, start, end, root=ARCHIVE_DIR):
+    """
+    Valors d'un camp entre `start` (inclòs) i `end` (exclòs), en passos de 30 min
+
+    `start` i `end` són dates (AAAA-MM-DD o date, a les 00:00 UTC) o
+    datetimes. Retorna un vector float32 (NaN on falta la dada): una vista
+    del fitxer mapat si el rang és dins d'un mes.
+    """
+    first, last = slot_number(start), slot_number(end)
+    pieces = []
+    position = first
+    while position < last:
+        day = EPOCH + timedelta(days=position // SLOTS)
+        month_start = slot_number(day.replace(day=1))
+        month_end = month_start + _month_length(day)
+        stop = min(last, month_end)
+        column = _column(station, _month_key(day), field, root)
+        if column is None:
+            pieces.append(np.full(stop - position, np.nan, dtype=DTYPE))
+        else:
+            pieces.append(column[position - month_start:stop - month_start])
+        position = stop
+    if not pieces:
+        return np.empty(0, dtype=DTYPE)
+    return pieces[0] if len(pieces) == 1 else np.concatenate(pieces)
+
+
+def range_times(start, end):
+    """Instants d'inici (datetime64 UTC) dels períodes de read_range(start, end)"""
+    first, last = slot_number(start), slot_number(end)
+    step = np.timedelta64(period_index.SLOT_MINUTES, 'm')
+    return np.datetime64('1970-01-01T00:00', 'm') + np.arange(first, last) * step
+
+
+def window_stats(station, field, days=7, end=None, root=ARCHIVE_DIR):
+    """Estadístiques dels últims `days` dies fins a `end` (per defecte, fins ara inclòs)"""
+    end = end or datetime.now(timezone.utc).date() + timedelta(days=1)
+    values = read_range(station, field, _to_date(end) - timedelta(days=days), end, root)
+    values = values[~np.isnan(values)].astype(np.float64)
+    if not len(values):
+        return {'count': 0, 'mean': None, 'min': None, 'max': None, 'sum': None}
+    return {
+        'count': int(len(values)),
+        'mean': round(float(values.mean()), 2),
+        'min': round(float(values.min()), 2),
+        'max': round(float(values.max()), 2),
+        'sum': round(float(values.sum()), 2),
+    }
+
+
+def import_daily_json(filename, root=ARCHIVE_DIR):
+    """Importa un data/weather_daily_AAAAMMDD.json; retorna el nombre d'estacions escrites"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    count = 0
+    for code, station in data.get('stations', {}).items():
+        if write_station_day(code, station.get('periods') or [], root):
+            count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Arxiu columnar binari d'observacions")
+    commands = parser.add_subparsers(dest='command', required=True)
+    importer = commands.add_parser('import', help="importa fitxers weather_daily_*.json")
+    importer.add_argument('files', nargs='*')
+    stats = commands.add_parser('stats', help="estadístiques dels últims dies")
+    stats.add_argument('station', help="codi de l'estació (p. ex. XJ)")
+    stats.add_argument('field', choices=FIELDS)
+    stats.add_argument('--days', type=int, nargs='+', default=[7, 30])
+    parser.add_argument('--root', default=ARCHIVE_DIR, help="directori de l'arxiu")
+    args = parser.parse_args(argv)
+
+    if args.command == 'import':
+        files = args.files or sorted(glob.glob(os.path.join('data', 'weather_daily_*.json')))
+        for filename in files:
+            print(f"📥 {filename}: {import_daily_json(filename, args.root)} estacions")
+        return 0
+
+    for days in args.days:
+        result = window_stats(args.station, args.field, days, root=args.root)
+        print(f"📊 {args.station} {args.field} ({days} dies): {result}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# daily_aggregates.py - AGREGATS DIARIS INCREMENTALS
+# Per cada estació es guarda l'agregat del dia (màxima i mínima amb el seu
+# període, pluja acumulada, recomptes i últim període processat) a
+# data/daily_aggregates.json. A cada execució només s'hi sumen els períodes
+# posteriors a l'últim processat. Els ja comptats no es recorren: un hash
+# (SHA-1 dels índexs i de les columnes tx/tn/ppt) detecta si la XEMA n'ha
+# revisat o tret algun, i només llavors l'agregat del dia es refà sencer.
+# Quan canvia la data UTC de la pàgina l'agregat es reinicia.
+# Els períodes es comparen pel seu índex 0-47 (period_index), no pel text.
+
+import json
+import os
+
+import period_index
+import station_day
+
+AGGREGATES_FILE = os.path.join('data', 'daily_aggregates.json')
+
+# Camps que entren a l'agregat
+FIELDS = ('tx', 'tn', 'ppt')
+
+
+class DailyAggregate:
+    """Agregat d'una estació per a un dia"""
+
+    def __init__(self, date=None):
+        self.reset(date)
+
+    def reset(self, date):
+        self.date = date
+        self.max_temp = None
+        self.max_temp_period = None
+        self.min_temp = None
+        self.min_temp_period = None
+        self.rain_total = 0.0
+        self.counts = {'temp_max': 0, 'temp_min': 0, 'rain': 0}
+        self.last_period = None
+        self.last_slot = None
+        # Hash dels períodes ja comptats (StationDay.digest dels FIELDS)
+        self.digest = None
+        # Aportació de cada període: {període: [tx, tn, ppt]}
+        self.contributions = {}
+
+    def _add(self, slot, period, values):
+        tx, tn, ppt = values
+        self.contributions[period] = list(values)
+        if tx is not None:
+            self.counts['temp_max'] += 1
+            if self.max_temp is None or tx > self.max_temp:
+                self.max_temp, self.max_temp_period = tx, period
+        if tn is not None:
+            self.counts['temp_min'] += 1
+            if self.min_temp is None or tn < self.min_temp:
+                self.min_temp, self.min_temp_period = tn, period
+        if ppt is not None:
+            self.counts['rain'] += 1
+            self.rain_total += ppt
+        if self.last_slot is None or slot > self.last_slot:
+            self.last_period, self.last_slot = period, slot
+
+    def _fold(self, day, start):
+        """Suma els períodes de `day` a partir de la posició `start`"""
+        for slot, (period, values) in zip(day.slots[start:], day.iter_values(FIELDS, start)):
+            self._add(slot, period, values)
+
+    def _rebuild(self, day):
+        """Refà l'agregat sencer (només si hi ha revisions); retorna els períodes revisats o trets"""
+        previous = self.contributions
+        self.reset(self.date)
+        self._fold(day, 0)
+        changed = sum(1 for period, values in previous.items()
+                      if self.contributions.get(period) != values)
+        return max(changed, 1)
+
+    def update(self, periods):
+        """
+        Aplica els períodes del dia (StationDay o diccionaris del resum diari)
+
+        Només es recorren els períodes posteriors a l'últim processat. Si el
+        hash dels anteriors no coincideix amb el guardat (revisions o
+        períodes que han desaparegut), l'agregat es refà. Retorna (nous, revisats).
+        """
+        if not periods:
+            return 0, 0
+        day = periods if isinstance(periods, station_day.StationDay) else \
+            station_day.StationDay.from_periods(periods)
+        if day.date != self.date:
+            self.reset(day.date)
+
+        done = 0 if self.last_slot is None else day.index_after(self.last_slot)
+        new = len(day) - done
+        revised = 0
+        if done and (done != len(self.contributions) or day.digest(FIELDS, done) != self.digest):
+            revised = self._rebuild(day)
+        else:
+            self._fold(day, done)
+        self.digest = day.digest(FIELDS)
+        return new, revised
+
+    @property
+    def total_periods(self):
+        return len(self.contributions)
+
+    def to_dict(self):
+        return {
+            'date': self.date,
+            'max_temp': self.max_temp,
+            'max_temp_period': self.max_temp_period,
+            'min_temp': self.min_temp,
+            'min_temp_period': self.min_temp_period,
+            'rain_total': self.rain_total,
+            'counts': self.counts,
+            'last_period': self.last_period,
+            'digest': self.digest,
+            'contributions': self.contributions,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        aggregate = cls(data.get('date'))
+        aggregate.max_temp = data.get('max_temp')
+        aggregate.max_temp_period = data.get('max_temp_period')
+        aggregate.min_temp = data.get('min_temp')
+        aggregate.min_temp_period = data.get('min_temp_period')
+        aggregate.rain_total = data.get('rain_total', 0.0)
+        aggregate.counts.update(data.get('counts', {}))
+        aggregate.last_period = data.get('last_period')
+        aggregate.last_slot = period_index.parse(aggregate.last_period)
+        aggregate.digest = data.get('digest')
+        aggregate.contributions = data.get('contributions', {})
+        return aggregate
+
+
+def load_aggregates(filename=AGGREGATES_FILE):
+    """Agregats guardats: {codi d'estació: DailyAggregate}"""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {code: DailyAggregate.from_dict(item) for code, item in data.items()}
+
+
+def save_aggregates(aggregates, filename=AGGREGATES_FILE):
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    tmp = f"{filename}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({code: aggregate.to_dict() for code, aggregate in aggregates.items()},
+                  f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp, filename)
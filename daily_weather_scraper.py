@@ -2,35 +2,87 @@
 # daily_weather_scraper.py - VERSIÓ COMPLETA DEL DIA (UTC)
 # VERSIÓ CORREGIDA: Guarda hora REAL de l'actualització
 
-import requests
-from bs4 import BeautifulSoup
-import pytz
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import hashlib
 import re
 import json
-import csv
 import os
 
-def write_log(message):
-    """Escriu un missatge al log i també el mostra per pantalla"""
-    print(message)
-    with open('debug_daily.log', 'a', encoding='utf-8') as f:
-        f.write(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - {message}\n")
+import artifacts
+import daily_aggregates
+import local_time
+import observation_snapshot
+import observation_store
+import period_index
+import run_log
+import station_csv
+import station_day
+import station_registry
+import xema_schema
 
-def get_today_date_spanish():
-    """Retorna la data actual en format dd/mm/aaaa"""
-    return datetime.now().strftime('%d/%m/%Y')
+# Configuració de les estacions (registre central stations.json)
+STATIONS = station_registry.stations_for('daily')
 
-def convertir_a_numero(text, default=None):
-    """Converteix text a número, retorna None si no és vàlid"""
-    if not text or text in ['(s/d)', '-', '', 'n/d', 'N/D']:
-        return None
-    try:
-        # Netejar possibles símbols
-        text = text.replace(',', '.').replace('°', '').replace('mm', '').replace('hPa', '').replace('W/m²', '')
-        return float(text.strip())
-    except:
-        return None
+# Log de l'execució (un sol fitxer obert, amb memòria intermèdia)
+LOG = run_log.RunLog('debug_daily.log', timestamps=True)
+
+# Dia de cada estació de l'execució anterior d'aquest procés (mode dimoni):
+# {codi: (capçalera, hash de les files, nombre de files, StationDay)}.
+# Si les primeres files de la pàgina no han canviat, només s'extreuen les noves
+_days = {}
+
+def write_log(message, level=run_log.INFO):
+    """Escriu un missatge al log i també el mostra per pantalla (segons el nivell)"""
+    LOG.log(message, level)
+
+def reset_log():
+    """Comença el log d'una execució nova (rota el fitxer si és massa gran)"""
+    LOG.start(f"=== INICI DAILY SCRAPER (UTC): {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')} ===")
+
+def get_today_date_spanish(date=None):
+    """Retorna la data `date` (AAAA-MM-DD, per defecte avui en UTC) en format dd/mm/aaaa"""
+    if date:
+        return datetime.strptime(date, '%Y-%m-%d').strftime('%d/%m/%Y')
+    return datetime.now(timezone.utc).strftime('%d/%m/%Y')
+
+def page_date(rows, now=None):
+    """
+    Data UTC (AAAA-MM-DD) del dia que mostra la pàgina, segons l'últim període
+    
+    Just després de mitjanit UTC la XEMA encara mostra el dia anterior
+    (local_time.period_date). None si no hi ha cap període.
+    """
+    for cells in reversed(rows or []):
+        date = local_time.period_date(cells[0] if cells else None, now)
+        if date:
+            return date
+    return None
+
+def rows_digest(rows):
+    """SHA-1 de les files de la taula (textos de les cel·les)"""
+    return hashlib.sha1(json.dumps(rows, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def observed_at(date, slot):
+    """'AAAA-MM-DD HH:MM:SS' (UTC) del final del període `slot` del dia `date`
+    
+    És l'hora de les dades, no la del rellotge: amb les mateixes dades els
+    JSON surten idèntics i artifacts no els reescriu.
+    """
+    end = datetime.strptime(date, '%Y-%m-%d') + timedelta(minutes=period_index.end_minutes(slot))
+    return end.strftime('%Y-%m-%d %H:%M:%S')
+
+def latest_observation(stations, previous=None):
+    """
+    observed_at més recent de les estacions
+    
+    Si cap estació en té (resums d'una versió anterior), es manté `previous`
+    (el generated_at ja desat); l'hora actual només si tampoc n'hi ha.
+    """
+    times = [s['summary']['observed_at'] for s in stations.values()
+             if s['summary'] and s['summary'].get('observed_at')]
+    if times:
+        return max(times)
+    return previous or datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
 
 def convertir_hora_tu_a_local(hora_tu_str):
     """Deixa les hores en UTC (sense conversió) - Només neteja"""
@@ -39,120 +91,127 @@ def convertir_hora_tu_a_local(hora_tu_str):
     # Netejar espais extra i retornar tal qual
     return re.sub(r'\s+', ' ', hora_tu_str.strip())
 
-def scrape_all_today_data(url, station_name):
+def scrape_all_today_data(url, station_name, previous=None, entry=None, aggregate=None, code=None):
     """
     Extreu TOTES les dades del dia actual de l'estació en UTC
     
+    `entry` és l'entrada de l'estació a la instantània d'observacions (si no
+    es passa, es descarrega ara). Si `previous` (entrada de l'estació al
+    JSON d'avui) es va extreure d'aquesta mateixa pàgina, es retornen les
+    seves dades.
+    `aggregate` és l'agregat diari guardat de l'estació (DailyAggregate):
+    només s'hi afegeixen els períodes nous. Amb `code`, el dia es guarda en
+    memòria i a la propera execució del procés només s'extreuen les files noves.
+    
     Retorna:
-    - periods_data: Llista amb totes les dades de cada període
+    - periods_data: Dades de cada període (StationDay: seqüència de diccionaris)
     - summary_data: Diccionari amb resums (màximes, mínimes, acumulats)
     """
     try:
-        write_log(f"\n🌐 Connectant a {station_name}...")
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        table = soup.find('table', {'class': 'tblperiode'})
+        if entry is None:
+            write_log(f"\n🌐 Connectant a {station_name}...")
+            entry = observation_snapshot.fetch_entry(url, name=station_name)
         
-        if not table:
-            write_log("❌ No s'ha trobat la taula tblperiode")
+        if entry.get('error'):
+            write_log(f"❌ {entry['error']}", run_log.ERROR)
             return None, None
         
-        # Trobar totes les files de dades
-        rows = table.find_all('tr')
-        write_log(f"📊 Total files trobades a la taula: {len(rows)}")
+        # Reutilitzem les dades d'avui només si es van extreure d'aquesta mateixa
+        # pàgina (hash del cos): `not_modified` és relatiu a la memòria cau
+        # compartida, que potser ha escalfat un altre script
+        previous = previous or {}
+        previous_summary = previous.get('summary') or {}
+        if (previous.get('periods') and entry.get('sha256')
+                and previous_summary.get('source_sha256') == entry['sha256']):
+            write_log(f"♻️  {station_name}: pàgina sense canvis, reutilitzant dades d'avui")
+            return previous['periods'], previous['summary']
         
-        # Llista per emmagatzemar totes les dades del dia
-        all_periods = []
+        # Files de dades (ja parsejades a la instantània, sense capçalera)
+        rows = entry['rows']
+        write_log(f"📊 Total files trobades a la taula: {len(rows) + 1}")
         
-        # Variables per a càlculs acumulats
-        temp_max_values = []
-        temp_min_values = []
-        rain_values = []
+        # Esquema de columnes a partir de la capçalera (compilat un cop per format)
+        schema = xema_schema.compile_schema(entry['header'])
+        columns = schema.columns
         
-        # Data actual
-        today = datetime.now().strftime('%Y-%m-%d')
+        # Dia UTC de la pàgina (no la data del rellotge de la màquina)
+        today = page_date(rows) or datetime.now(timezone.utc).strftime('%Y-%m-%d')
         
-        # Recórrer totes les files (excepte capçaleres)
-        for i, row in enumerate(rows):
-            cells = row.find_all(['td', 'th'])
-            
+        # Si les primeres files són les mateixes que l'última vegada (mateix
+        # dia i capçalera), es continua el dia en memòria des de la primera fila nova
+        start = 0
+        cached = _days.get(code) if code else None
+        if (cached and cached[0] == entry['header'] and cached[3].date == today
+                and len(rows) >= cached[2] and rows_digest(rows[:cached[2]]) == cached[1]):
+            all_periods, start = cached[3], cached[2]
+            write_log(f"♻️  {start} files ja processades, {len(rows) - start} de noves")
+        else:
+            # Totes les dades del dia, en columnes (gn, vvm, dvm, vvx, pm i rs
+            # només si l'estació té la columna)
+            all_periods = station_day.StationDay(station_name, today, extra_fields=columns)
+        
+        # Recórrer les files (excepte capçaleres i les ja processades)
+        for cells in rows[start:]:
             # Necessitem almenys 6 columnes per tenir dades completes
             if len(cells) < 6:
                 continue
             
-            periode = cells[0].get_text(strip=True)
+            periode = cells[0]
             
-            # Verificar si és un període vàlid (hh:mm - hh:mm)
-            if re.match(r'\d{1,2}:\d{2}\s*[-–]\s*\d{1,2}:\d{2}', periode):
+            # Verificar si és un període vàlid (hh:mm - hh:mm): índex 0-47
+            slot = period_index.parse(periode)
+            if slot is not None:
                 # Deixar període en UTC (sense conversió)
                 periode_utc = convertir_hora_tu_a_local(periode)
                 
-                # Extreure totes les dades disponibles
-                period_data = {
-                    'station_name': station_name,
-                    'date': today,
-                    'period': periode_utc,
-                    'period_utc': periode_utc,  # Explicítament marcat com UTC
-                    'tm': convertir_a_numero(cells[1].get_text(strip=True)) if len(cells) > 1 else None,  # Temp mitjana
-                    'tx': convertir_a_numero(cells[2].get_text(strip=True)) if len(cells) > 2 else None,  # Temp màxima
-                    'tn': convertir_a_numero(cells[3].get_text(strip=True)) if len(cells) > 3 else None,  # Temp mínima
-                    'hr': convertir_a_numero(cells[4].get_text(strip=True)) if len(cells) > 4 else None,  # Humitat
-                    'ppt': convertir_a_numero(cells[5].get_text(strip=True)) if len(cells) > 5 else None, # Pluja
-                }
-                
-                # Afegir dades addicionals si existeixen
-                if len(cells) > 6:
-                    period_data['vvm'] = convertir_a_numero(cells[6].get_text(strip=True))  # Vent mitjà
-                if len(cells) > 7:
-                    period_data['dvm'] = convertir_a_numero(cells[7].get_text(strip=True))  # Direcció vent
-                if len(cells) > 8:
-                    period_data['vvx'] = convertir_a_numero(cells[8].get_text(strip=True))  # Vent màxim
-                if len(cells) > 9:
-                    period_data['pm'] = convertir_a_numero(cells[9].get_text(strip=True))   # Pressió
-                if len(cells) > 10:
-                    period_data['rs'] = convertir_a_numero(cells[10].get_text(strip=True))  # Radiació
+                # Extreure totes les dades disponibles segons l'esquema
+                valors = schema.extract(cells)
                 
                 # Només afegir si tenim almenys alguna dada de temperatura o pluja
-                if period_data['tx'] is not None or period_data['tn'] is not None or period_data['ppt'] is not None:
-                    all_periods.append(period_data)
+                if valors.get('tx') is not None or valors.get('tn') is not None or valors.get('ppt') is not None:
+                    all_periods.append(periode_utc, valors, slot)
                     
-                    # Acumular per a càlculs
-                    if period_data['tx'] is not None:
-                        temp_max_values.append(period_data['tx'])
-                    if period_data['tn'] is not None:
-                        temp_min_values.append(period_data['tn'])
-                    if period_data['ppt'] is not None:
-                        rain_values.append(period_data['ppt'])
-                    
-                    write_log(f"   ✅ Període UTC: {periode_utc} | TX: {period_data['tx']} | TN: {period_data['tn']} | Pluja: {period_data['ppt']}")
+                    write_log(f"   ✅ Període UTC: {periode_utc} | TX: {valors.get('tx')} | TN: {valors.get('tn')} | Pluja: {valors.get('ppt')}", run_log.DEBUG)
         
         write_log(f"📈 Total períodes vàlids trobats: {len(all_periods)}")
+        if code:
+            _days[code] = (entry['header'], rows_digest(rows), len(rows), all_periods)
+        
+        # Períodes que falten entre el primer i l'últim
+        missing = [period_index.label(slot) for slot in all_periods.missing_slots()]
+        if missing:
+            write_log(f"⚠️  Falten {len(missing)} períodes: {', '.join(missing)}", run_log.WARNING)
         
         if not all_periods:
-            write_log("❌ No s'han trobat dades vàlides per al dia d'avui")
+            write_log("❌ No s'han trobat dades vàlides per al dia d'avui", run_log.ERROR)
             return None, None
         
-        # Calcular resums - IMPORTANT: Guardar l'hora REAL de l'actualització
-        update_time = datetime.now().strftime('%H:%M')
+        # Agregat del dia: només s'hi sumen els períodes nous
+        if aggregate is None:
+            aggregate = daily_aggregates.DailyAggregate()
+        new, revised = aggregate.update(all_periods)
+        write_log(f"🧮 Agregat diari: {new} períodes nous, {revised} revisats")
+        
+        # Calcular resums - L'hora d'actualització és la del final de l'últim
+        # període (UTC): no canvia si les dades no canvien
+        observed = observed_at(today, all_periods.last_slot)
         summary = {
             'station_name': station_name,
             'date': today,
-            'date_spanish': get_today_date_spanish(),
-            'last_period': all_periods[-1]['period'] if all_periods else "N/D",
-            'last_period_utc': all_periods[-1]['period'] if all_periods else "N/D",
-            'updated_at': update_time,  # HORA REAL de l'actualització (NO canvia)
-            'total_periods': len(all_periods),
-            'max_temp': max(temp_max_values) if temp_max_values else None,
-            'min_temp': min(temp_min_values) if temp_min_values else None,
-            'total_rain': sum(rain_values) if rain_values else 0.0,
-            'periods_with_data': {
-                'temp_max': len(temp_max_values),
-                'temp_min': len(temp_min_values),
-                'rain': len(rain_values)
-            },
+            'date_spanish': get_today_date_spanish(today),
+            'last_period': all_periods.periods[-1] if all_periods else "N/D",
+            'last_period_utc': all_periods.periods[-1] if all_periods else "N/D",
+            'updated_at': observed[11:16],  # HH:MM (UTC) de les dades més recents
+            'observed_at': observed,
+            'total_periods': aggregate.total_periods,
+            'max_temp': aggregate.max_temp,
+            'max_temp_period': aggregate.max_temp_period,
+            'min_temp': aggregate.min_temp,
+            'min_temp_period': aggregate.min_temp_period,
+            'total_rain': aggregate.rain_total,
+            'periods_with_data': dict(aggregate.counts),
+            'missing_periods': missing,
+            'source_sha256': entry.get('sha256'),
             'timezone_note': 'Les hores estan en UTC (Temps Universal Coordinat). Per obtenir l\'hora local, suma 1 hora (hivern) o 2 hores (estiu).'
         }
         
@@ -166,41 +225,94 @@ def scrape_all_today_data(url, station_name):
         return all_periods, summary
         
     except Exception as e:
-        write_log(f"❌ Error consultant dades completes: {e}")
+        write_log(f"❌ Error consultant dades completes: {e}", run_log.ERROR)
         return None, None
 
+def load_json(filename):
+    """Llegeix un fitxer JSON, retorna None si no existeix o no és vàlid"""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
 def save_to_json(data, filename):
     """Guarda les dades en format JSON"""
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        write_log(f"💾 Dades guardades a {filename}")
+        if artifacts.write_json(filename, data, ensure_ascii=False, indent=2, default=station_day.json_default):
+            write_log(f"💾 Dades guardades a {filename}")
+        else:
+            write_log(f"♻️  {filename} sense canvis")
         return True
     except Exception as e:
-        write_log(f"❌ Error guardant JSON: {e}")
+        write_log(f"❌ Error guardant JSON: {e}", run_log.ERROR)
         return False
 
 def save_to_csv(periods_data, filename):
-    """Guarda les dades en format CSV"""
+    """Guarda les dades en format CSV (només s'afegeixen els períodes nous)"""
     try:
         if not periods_data:
-            write_log("⚠️  No hi ha dades per guardar en CSV")
+            write_log("⚠️  No hi ha dades per guardar en CSV", run_log.WARNING)
             return False
         
-        # Crear capçaleres basades en les claus del primer element
-        fieldnames = list(periods_data[0].keys())
+        # Columnes fixes; només s'escriuen les files noves o revisades
+        mode, written = station_csv.write(periods_data, filename)
         
-        with open(filename, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(periods_data)
-        
-        write_log(f"💾 Dades guardades a {filename} ({len(periods_data)} registres)")
+        write_log(f"💾 Dades guardades a {filename} ({len(periods_data)} registres, {written} escrits: {mode})")
         return True
     except Exception as e:
-        write_log(f"❌ Error guardant CSV: {e}")
+        write_log(f"❌ Error guardant CSV: {e}", run_log.ERROR)
         return False
 
+def add_statistics(all_data):
+    """Afegeix les estadístiques diàries i horàries de totes les estacions (d'un cop, amb NumPy)"""
+    codes, days = [], []
+    for station_code, data in all_data['stations'].items():
+        if not data['summary']:
+            continue
+        day = data['periods']
+        if not isinstance(day, station_day.StationDay):
+            # Dades reutilitzades del JSON d'avui (llista de diccionaris)
+            day = station_day.StationDay.from_periods(day)
+        if day:
+            codes.append(station_code)
+            days.append(day)
+    
+    # NumPy només es carrega quan hi ha estadístiques per calcular
+    import station_stats
+    
+    try:
+        daily = station_stats.daily_stats(days)
+        hourly = station_stats.hourly_stats(days)
+        derived = station_stats.derived_stats(days)
+    except Exception as e:
+        write_log(f"⚠️  Error calculant les estadístiques: {e}", run_log.WARNING)
+        return
+    
+    for station_code, stats, hours, extra in zip(codes, daily, hourly, derived):
+        all_data['stations'][station_code]['summary']['stats'] = stats
+        all_data['stations'][station_code]['summary']['derived'] = extra
+        all_data['stations'][station_code]['hourly'] = hours
+    write_log(f"📐 Estadístiques calculades per {len(days)} estacions")
+
+def store_periods(store, station_code, periods_data):
+    """Desa a l'arxiu històric els períodes nous o revisats d'una estació"""
+    try:
+        new, revised = store.upsert_periods(station_code, periods_data)
+        write_log(f"🗄️  Arxiu: {new} períodes nous, {revised} revisats")
+    except Exception as e:
+        write_log(f"⚠️  Error desant a l'arxiu històric: {e}", run_log.WARNING)
+
+def archive_periods(station_code, periods_data):
+    """Desa el dia de l'estació a l'arxiu columnar (float32 per camp i mes)"""
+    import columnar_archive
+    
+    try:
+        fields = columnar_archive.write_station_day(station_code, periods_data)
+        write_log(f"🧊 Arxiu columnar: {len(fields)} camps")
+    except Exception as e:
+        write_log(f"⚠️  Error desant a l'arxiu columnar: {e}", run_log.WARNING)
+
 def main():
     """Funció principal"""
     
@@ -209,18 +321,7 @@ def main():
     write_log("=" * 60)
     
     # Configuració de les estacions
-    stations = [
-        {
-            'name': 'Fornells de la Selva',
-            'code': 'UO',
-            'url': 'https://www.meteo.cat/observacions/xema/dades?codi=UO'
-        },
-        {
-            'name': 'Girona',
-            'code': 'XJ',
-            'url': 'https://www.meteo.cat/observacions/xema/dades?codi=XJ'
-        }
-    ]
+    stations = STATIONS
     
     # Crear directori data si no existeix
     os.makedirs('data', exist_ok=True)
@@ -228,7 +329,7 @@ def main():
     # Diccionari per emmagatzemar totes les dades
     all_data = {
         'metadata': {
-            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'generated_at': None,  # hora de les dades més recents (es completa al final)
             'timezone': 'UTC',
             'note': 'Les hores estan en UTC. Per hora local: +1h (hivern) o +2h (estiu)',
             'total_stations': len(stations)
@@ -236,13 +337,40 @@ def main():
         'stations': {}
     }
     
-    # Processar cada estació
+    # Instantània compartida: cada estació es descarrega i parseja una sola
+    # vegada per execució (generate_meteo_rss.py la reutilitza)
+    write_log(f"\n📡 Obtenint la instantània de {len(stations)} estacions...")
+    snapshot = observation_snapshot.get_snapshot(stations)
+    
+    # Dia UTC de les pàgines (el més recent): just després de mitjanit encara
+    # és l'anterior i les dades van al fitxer d'aquell dia
+    dates = [page_date(entry.get('rows')) for entry in snapshot['stations'].values()]
+    day = max([d for d in dates if d], default=None) or datetime.now(timezone.utc).strftime('%Y-%m-%d')
+    
+    # Dades ja guardades del dia (per reutilitzar-les si la pàgina no ha canviat)
+    json_filename = f"data/weather_daily_{day.replace('-', '')}.json"
+    previous_data = load_json(json_filename) or {}
+    previous_stations = previous_data.get('stations', {})
+    
+    # Arxiu històric (només s'hi escriuen els períodes nous o revisats)
+    store = observation_store.ObservationStore()
+    
+    # Agregats diaris guardats (màximes, mínimes i pluja incrementals)
+    aggregates = daily_aggregates.load_aggregates()
+    
+    # Processar cada estació (en l'ordre de la llista)
     for station in stations:
         write_log(f"\n{'='*50}")
         write_log(f"📡 Processant: {station['name']} [{station['code']}]")
         
         # Obtenir totes les dades del dia
-        periods_data, summary_data = scrape_all_today_data(station['url'], station['name'])
+        periods_data, summary_data = scrape_all_today_data(
+            station['url'], station['name'],
+            previous=previous_stations.get(station['code']),
+            entry=snapshot['stations'].get(station['code']),
+            aggregate=aggregates.setdefault(station['code'], daily_aggregates.DailyAggregate()),
+            code=station['code']
+        )
         
         if periods_data and summary_data:
             # Guardar a l'estructura principal
@@ -257,12 +385,15 @@ def main():
             }
             
             # Guardar CSV individual per estació (opcional)
-            csv_filename = f"data/{station['code']}_{datetime.now().strftime('%Y%m%d')}.csv"
+            csv_filename = f"data/{station['code']}_{summary_data['date'].replace('-', '')}.csv"
             save_to_csv(periods_data, csv_filename)
             
+            store_periods(store, station['code'], periods_data)
+            archive_periods(station['code'], periods_data)
+            
             write_log(f"✅ {station['name']}: {len(periods_data)} períodes processats")
         else:
-            write_log(f"❌ {station['name']}: No s'han pogut obtenir dades")
+            write_log(f"❌ {station['name']}: No s'han pogut obtenir dades", run_log.ERROR)
             # Crear estructura buida
             all_data['stations'][station['code']] = {
                 'info': {
@@ -274,14 +405,26 @@ def main():
                 'summary': None
             }
     
+    store.close()
+    
+    # Estadístiques de totes les estacions d'un sol cop
+    add_statistics(all_data)
+    
+    try:
+        daily_aggregates.save_aggregates(aggregates)
+    except Exception as e:
+        write_log(f"⚠️  Error guardant els agregats diaris: {e}", run_log.WARNING)
+    
     # Guardar totes les dades en un sol fitxer JSON
-    json_filename = f"data/weather_daily_{datetime.now().strftime('%Y%m%d')}.json"
+    generated_at = latest_observation(all_data['stations'],
+                                      previous_data.get('metadata', {}).get('generated_at'))
+    all_data['metadata']['generated_at'] = generated_at
     save_to_json(all_data, json_filename)
     
     # Guardar també un fitxer de resum per al HTML
     summary_for_html = {
-        'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'date_spanish': get_today_date_spanish(),
+        'generated_at': generated_at,
+        'date_spanish': get_today_date_spanish(day),
         'timezone': 'UTC',
         'timezone_note': 'Les hores estan en UTC. Per hora local: +1h (hivern) o +2h (estiu)',
         'stations': {}
@@ -309,12 +452,13 @@ def main():
             write_log(f"   • Últim període: {summary['last_period']} UTC")
             write_log(f"   • Actualització: {summary['updated_at']}")
         else:
-            write_log(f"\n⚠️  {station_code}: Sense dades")
+            write_log(f"\n⚠️  {station_code}: Sense dades", run_log.WARNING)
     
     write_log(f"\n💾 Fitxers generats:")
     write_log(f"   • data/weather_summary.json (per HTML)")
     write_log(f"   • data/weather_daily_YYYYMMDD.json (complet)")
     write_log(f"   • data/XX_YYYYMMDD.csv (per estació)")
+    write_log(f"   • {observation_store.DB_FILE} (arxiu històric)")
     
     write_log("\n✅ PROCÉS COMPLETAT")
     write_log("=" * 60)
@@ -323,8 +467,7 @@ def main():
 
 if __name__ == "__main__":
     # Netejar log anterior
-    with open('debug_daily.log', 'w', encoding='utf-8') as f:
-        f.write(f"=== INICI DAILY SCRAPER (UTC): {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===\n")
+    reset_log()
     
     try:
         result = main()
@@ -334,5 +477,5 @@ if __name__ == "__main__":
         else:
             print("\n⚠️  No s'han processat estacions")
     except Exception as e:
-        write_log(f"💥 ERROR CRÍTIC: {e}")
+        write_log(f"💥 ERROR CRÍTIC: {e}", run_log.ERROR)
         print(f"\n❌ Error durant l'execució: {e}")
\ No newline at end of file
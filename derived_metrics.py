@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# derived_metrics.py - MAGNITUDS DERIVADES (NumPy)
+# A partir de la temperatura (tm), la humitat relativa (hr) i el vent mitjà
+# (vvm) calcula, per a totes les estacions i períodes d'un sol cop:
+#   - punt de rosada (fórmula de Magnus)
+#   - índex de calor (regressió de Rothfusz, NWS) si T ≥ 27 °C i HR ≥ 40 %
+#   - sensació de fred (wind chill, fórmula canadenca) si T ≤ 10 °C i vent > 4,8 km/h
+#   - temperatura aparent: sensació de fred, índex de calor o la temperatura
+# Tots els càlculs treballen amb arrays; NaN on no es pot calcular.
+
+import numpy as np
+
+# Constants de Magnus (Alduchov i Eskridge)
+MAGNUS_A = 17.625
+MAGNUS_B = 243.04
+
+HEAT_INDEX_MIN_TEMP = 27.0
+HEAT_INDEX_MIN_RH = 40.0
+WIND_CHILL_MAX_TEMP = 10.0
+WIND_CHILL_MIN_WIND = 4.8   # km/h
+
+KNOTS_TO_KMH = 1.852
+
+# Claus que s'afegeixen a cada registre
+DERIVED_KEYS = ('dew_point', 'heat_index', 'wind_chill', 'feels_like')
+
+
+def _array(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def dew_point(temp, rh):
+    """Punt de rosada (°C) a partir de la temperatura (°C) i la humitat relativa (%)"""
+    temp, rh = _array(temp), _array(rh)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        gamma = np.log(np.where(rh > 0, rh, np.nan) / 100.0) + MAGNUS_A * temp / (MAGNUS_B + temp)
+        return MAGNUS_B * gamma / (MAGNUS_A - gamma)
+
+
+def relative_humidity(temp, dew):
+    """Humitat relativa (%) a partir de la temperatura i el punt de rosada (°C)"""
+    temp, dew = _array(temp), _array(dew)
+    with np.errstate(invalid='ignore', over='ignore'):
+        rh = 100.0 * np.exp(MAGNUS_A * dew / (MAGNUS_B + dew) - MAGNUS_A * temp / (MAGNUS_B + temp))
+    return np.minimum(rh, 100.0)
+
+
+def heat_index(temp, rh):
+    """Índex de calor (°C); NaN fora del rang de validesa"""
+    temp, rh = _array(temp), _array(rh)
+    t = temp * 9.0 / 5.0 + 32.0
+    hi = (-42.379 + 2.04901523 * t + 10.14333127 * rh
+          - 0.22475541 * t * rh - 6.83783e-3 * t * t - 5.481717e-2 * rh * rh
+          + 1.22874e-3 * t * t * rh + 8.5282e-4 * t * rh * rh - 1.99e-6 * t * t * rh * rh)
+    valid = (temp >= HEAT_INDEX_MIN_TEMP) & (rh >= HEAT_INDEX_MIN_RH)
+    return np.where(valid, (hi - 32.0) * 5.0 / 9.0, np.nan)
+
+
+def wind_chill(temp, wind_kmh):
+    """Sensació de fred (°C) amb el vent en km/h; NaN fora del rang de validesa"""
+    temp, wind = _array(temp), _array(wind_kmh)
+    with np.errstate(invalid='ignore'):
+        v = np.power(np.where(wind > 0, wind, np.nan), 0.16)
+    wc = 13.12 + 0.6215 * temp - 11.37 * v + 0.3965 * temp * v
+    valid = (temp <= WIND_CHILL_MAX_TEMP) & (wind > WIND_CHILL_MIN_WIND)
+    return np.where(valid, wc, np.nan)
+
+
+def apparent_temperature(temp, rh, wind_kmh):
+    """Temperatura aparent: sensació de fred, índex de calor o la temperatura"""
+    temp = _array(temp)
+    wc = wind_chill(temp, wind_kmh)
+    hi = heat_index(temp, rh)
+    return np.where(~np.isnan(wc), wc, np.where(~np.isnan(hi), hi, temp))
+
+
+def compute(temp, rh, wind_kmh):
+    """Totes les magnituds derivades: {clau: array}"""
+    return {
+        'dew_point': dew_point(temp, rh),
+        'heat_index': heat_index(temp, rh),
+        'wind_chill': wind_chill(temp, wind_kmh),
+        'feels_like': apparent_temperature(temp, rh, wind_kmh),
+    }
+
+
+def _column(records, key):
+    return np.array([np.nan if r.get(key) is None else r[key] for r in records], dtype=np.float64)
+
+
+def add_derived(records, temp_key='tm', rh_key='hr', wind_key='vvm'):
+    """
+    Afegeix les magnituds derivades a una llista de diccionaris (un sol càlcul)
+
+    Només s'afegeixen les claus que es poden calcular (arrodonides a una
+    decimal); les que no, es treuen del registre.
+    """
+    if not records:
+        return records
+    derived = compute(_column(records, temp_key), _column(records, rh_key), _column(records, wind_key))
+    for key in DERIVED_KEYS:
+        values = np.round(derived[key], 1).tolist()
+        for record, value in zip(records, values):
+            if value == value:
+                record[key] = value
+            else:
+                record.pop(key, None)
+    return records
+
+
+def add_metar_derived(metars):
+    """Afegeix humitat i magnituds derivades als camps METAR (parse_fields) de tots els aeroports"""
+    if not metars:
+        return metars
+    temp = _column(metars, 'temp_c')
+    dew = _column(metars, 'dewpoint_c')
+    wind = np.array([np.nan if not m.get('wind') else m['wind']['speed_kt'] * KNOTS_TO_KMH
+                     for m in metars], dtype=np.float64)
+    rh = relative_humidity(temp, dew)
+    derived = compute(temp, rh, wind)
+    columns = {'humidity_pct': np.round(rh, 0)}
+    columns.update({f'{key}_c': np.round(derived[key], 1) for key in ('heat_index', 'wind_chill', 'feels_like')})
+    for key, array in columns.items():
+        for metar, value in zip(metars, array.tolist()):
+            if value == value:
+                metar[key] = value
+    return metars
+
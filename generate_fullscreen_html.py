@@ -6,33 +6,24 @@
 # 3. Hora d'actualització en CAT (no UTC)
 
 import json
-from datetime import datetime
 import os
-import pytz  # <-- NOU IMPORT
 
-def convert_utc_to_cat(utc_time_str):
-    """Converteix hora UTC a hora local CAT"""
+import artifacts
+import local_time
+import station_registry
+
+def convert_utc_to_cat(utc_time_str, date=None):
+    """Converteix hora UTC a hora local CAT (del dia `date`, AAAA-MM-DD; per defecte avui)"""
     try:
         if not utc_time_str or utc_time_str == 'N/D':
             return utc_time_str
             
-        # Parseja l'hora UTC
-        utc_time = datetime.strptime(utc_time_str, "%H:%M")
-        
-        # Assumim que és avui
-        today = datetime.now().date()
-        utc_datetime = datetime.combine(today, utc_time.time())
-        
-        # Aplica zona horària
-        utc_zone = pytz.utc
-        cat_zone = pytz.timezone('Europe/Madrid')
-        
-        # Converteix
-        utc_datetime = utc_zone.localize(utc_datetime)
-        cat_datetime = utc_datetime.astimezone(cat_zone)
+        cat_time = local_time.hhmm_to_local(utc_time_str, date)
+        if cat_time is None:
+            return utc_time_str
         
         # Formata com a hora local
-        return cat_datetime.strftime("%H:%M") + " (CAT)"
+        return cat_time + " (CAT)"
         
     except Exception as e:
         print(f"⚠️  Error convertint hora {utc_time_str}: {e}")
@@ -65,6 +56,20 @@ def create_html_for_station(station_data, station_code, station_name):
     # Hora de l'actualització (la que està al JSON)
     update_time = station_data.get('updated_at', 'N/D')
     
+    # Magnituds derivades de l'últim període (si n'hi ha)
+    derived = station_data.get('derived') or {}
+    derived_parts = []
+    if derived.get('feels_like') is not None:
+        derived_parts.append(f"Sensació tèrmica {format_temperature(derived['feels_like'])}ºC")
+    if derived.get('dew_point') is not None:
+        derived_parts.append(f"Punt de rosada {format_temperature(derived['dew_point'])}ºC")
+    derived_html = ''
+    if derived_parts:
+        derived_html = f'''
+            <div class="period-note">
+                <i class="fas fa-temperature-half"></i> {' · '.join(derived_parts)}
+            </div>'''
+    
     # Crear contingut HTML
     html_content = f'''<!DOCTYPE html>
 <html lang="ca">
@@ -362,7 +367,7 @@ def create_html_for_station(station_data, station_code, station_name):
                 <i class="far fa-calendar-alt"></i> {station_data.get('date_spanish', 'N/D')}
             </div>
             <div class="info-box">
-                <i class="fas fa-sync-alt"></i> {convert_utc_to_cat(update_time)}
+                <i class="fas fa-sync-alt"></i> {convert_utc_to_cat(update_time, station_data.get('date'))}
             </div>
         </div>
         
@@ -373,7 +378,7 @@ def create_html_for_station(station_data, station_code, station_name):
             </div>
             <div class="period-note">
                 <span class="note-asterisk">*</span> Sumar 1 hora (hivern) o 2 hores (estiu) per a l'hora local
-            </div>
+            </div>{derived_html}
         </div>
         
         <!-- DADES PRINCIPALS - AMB TEXT COMPLET -->
@@ -463,9 +468,10 @@ def create_html_for_station(station_data, station_code, station_name):
 def save_html_file(content, filename):
     """Guarda el contingut HTML a un fitxer"""
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"✅ HTML guardat: {filename}")
+        if artifacts.write_text(filename, content):
+            print(f"✅ HTML guardat: {filename}")
+        else:
+            print(f"♻️  HTML sense canvis: {filename}")
         return True
     except Exception as e:
         print(f"❌ Error guardant HTML {filename}: {e}")
@@ -499,31 +505,25 @@ def main():
     
     print(f"📊 Dades carregades. Estacions: {list(stations.keys())}")
     
-    # Mapeig de codis a noms
-    station_info = {
-        'UO': 'Fornells de la Selva',
-        'XJ': 'Girona'
-    }
+    # Registre central d'estacions (noms i fitxers HTML)
+    registry = station_registry.load_registry()
     
     # Diccionari per evitar noms duplicats
     generated_files = {}
     
     # Generar HTMLs - SOLAMENT ELS DOS NECESSARIS
     for station_code, data in stations.items():
-        station_name = station_info.get(station_code, f"Estació {station_code}")
+        station = registry.get(station_code)
+        station_name = station['name'] if station else f"Estació {station_code}"
         
         print(f"\n📡 Processant: {station_name}")
         
         html_content = create_html_for_station(data, station_code, station_name)
         
-        # NOMS DEFINITIUS I FIXOS - SOLAMENT AQUESTOS DOS
-        if station_code == 'XJ':
-            filename = "girona_full_screen.html"
-        elif station_code == 'UO':
-            filename = "fornells_full_screen.html"
-        else:
-            # No hauria d'arribar aquí, però per si de cas
-            print(f"⚠️  Estació no reconeguda: {station_code}")
+        # NOMS DEFINITIUS I FIXOS - els que indica el registre (stations.json)
+        filename = registry.html_file(station_code)
+        if not filename:
+            print(f"⚠️  Estació sense HTML al registre: {station_code}")
             continue
         
         # Verificar que no es generi duplicat
@@ -565,10 +565,9 @@ def main():
     
     print("\n🌐 URLs DEFINITIVES:")
     print("=" * 60)
-    print("   📍 Girona:")
-    print("      https://joandecorts.github.io/meteo-rss-auto/girona_full_screen.html")
-    print("\n   📍 Fornells de la Selva:")
-    print("      https://joandecorts.github.io/meteo-rss-auto/fornells_full_screen.html")
+    for station in registry.for_output('html'):
+        print(f"   📍 {station['name']}:")
+        print(f"      https://joandecorts.github.io/meteo-rss-auto/{station['outputs']['html']}")
     
     print("\n🎯 CARACTERÍSTIQUES:")
     print("=" * 60)
@@ -1,223 +1,176 @@
 #!/usr/bin/env python3
 # generate_meteo_rss.py - VERSIÓ DEFINITIVA CORREGIDA (Llegendes completes)
-import requests
-from bs4 import BeautifulSoup
-import pytz
-from datetime import datetime, timedelta
-import re
+from datetime import datetime, timezone
 import sys
 import os
 import json
+import re
+from email.utils import parsedate_to_datetime
+
+import adaptive_polling
+import artifacts
+import http_cache
+import local_time
+import observation_snapshot
+import period_index
+import run_log
+import station_registry
+import xema_parser
+import xema_schema
+from station_fetcher import fetch_stations
+
+# Estacions del RSS (registre central stations.json)
+STATIONS = station_registry.stations_for('rss')
+
+# Log de l'execució (un sol fitxer obert, amb memòria intermèdia)
+LOG = run_log.RunLog('debug.log')
+
+def write_log(message, level=run_log.INFO):
+    """Escriu un missatge al log i també el mostra per pantalla (segons el nivell)"""
+    LOG.log(message, level)
+
+def reset_log():
+    """Comença el log d'una execució nova (rota el fitxer si és massa gran)"""
+    LOG.start(f"=== INICI: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')} ===")
+
+def buscar_dades_recents(rows_reversed, schema, station_name, url):
+    """Retorna les dades del període vàlid més recent
+    
+    `rows_reversed` són les files de dades començant pel FINAL de la taula
+    (pot ser un generador: només es parsegen les files que calgui).
+    """
+    for cells in rows_reversed:
+        if len(cells) < 2:  # Almenys període i una dada
+            continue
+            
+        periode = cells[0]
+        
+        if period_index.parse(periode) is not None:
+            # Inicialitzem dades
+            dades_extretes = {
+                'station_name': station_name,
+                'station_code': url.split('codi=')[1][:2] if 'codi=' in url else '',
+                'periode': periode
+            }
+            
+            # Processem cada columna de l'esquema (valors numèrics)
+            dades_extretes.update(schema.extract(cells))
+            
+            # Netegem les dades que no existeixen (valor None)
+            dades_finales = {k: v for k, v in dades_extretes.items() if v is not None}
+            
+            write_log(f"✅ Dades RECENTS trobades: {periode}")
+            write_log("📊 Dades extretes:", run_log.DEBUG)
+            for key, value in dades_finales.items():
+                if key not in ['station_name', 'station_code', 'periode']:
+                    write_log(f"   • {key}: {value}", run_log.DEBUG)
+            
+            # Verifiquem que tenim dades suficients
+            if len([k for k in dades_finales.keys() if k not in ['station_name', 'station_code', 'periode']]) > 0:
+                return dades_finales
+            else:
+                write_log("⚠️  Dades insuficients, buscant més...", run_log.WARNING)
+    
+    write_log("❌ No s'han trobat dades vàlides", run_log.ERROR)
+    return None
 
-def write_log(message):
-    """Escriu un missatge al log i també el mostra per pantalla"""
-    print(message)
-    with open('debug.log', 'a', encoding='utf-8') as f:
-        f.write(message + '\n')
+def log_columnes(columnes, columna_mapping):
+    """Mostra les columnes detectades i el seu mapeig"""
+    write_log(f"📋 Columnes detectades ({len(columnes)}):", run_log.DEBUG)
+    for idx, col in enumerate(columnes):
+        write_log(f"   [{idx}] {col}", run_log.DEBUG)
+    write_log(f"🔍 Mapeig de columnes: {columna_mapping}", run_log.DEBUG)
 
-def scrape_meteocat_data(url, station_name):
-    """Extreu TOTES les dades disponibles de cada estació - VERSIÓ MILLORADA"""
+def pagina_processada(previous, sha256):
+    """True si `previous` (dades guardades) es va extreure d'una pàgina amb aquest hash
+    
+    No n'hi ha prou amb `not_modified` de la memòria cau: és relatiu a
+    l'última descàrrega (potser d'un altre script), no al que aquest RSS ja
+    ha processat.
+    """
+    return bool(previous) and sha256 is not None and previous.get('source_sha256') == sha256
+
+def scrape_latest_observation(url, station_name, previous=None):
+    """Extreu NOMÉS l'últim període complet de l'estació (camí ràpid)
+    
+    Descarrega la pàgina i recorre la taula des del final sense parsejar
+    totes les files. Retorna el mateix diccionari que scrape_meteocat_data.
+    """
     try:
         write_log(f"🌐 Connectant a {station_name}...")
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
+        response = http_cache.fetch(url, max_age=observation_snapshot.CACHE_MAX_AGE)
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        table = soup.find('table', {'class': 'tblperiode'})
+        if pagina_processada(previous, response.sha256):
+            write_log(f"♻️  {station_name}: pàgina sense canvis, no cal parsejar")
+            return previous
         
-        if not table:
-            write_log("❌ No s'ha trobat la taula")
+        columnes = xema_parser.parse_header(response.content)
+        if columnes is None:
+            write_log("❌ No s'ha trobat la taula", run_log.ERROR)
             return None
-            
-        rows = table.find_all('tr')
-        write_log(f"📊 {len(rows)} files trobades")
         
-        if len(rows) < 2:
-            write_log("❌ Taula massa curta per tenir dades")
+        schema = xema_schema.compile_schema(columnes)
+        log_columnes(columnes, schema.columns)
+        
+        dades = buscar_dades_recents(xema_parser.iter_rows_reversed(response.content),
+                                     schema, station_name, url)
+        if dades:
+            dades['source_sha256'] = response.sha256
+        return dades
+        
+    except Exception as e:
+        write_log(f"❌ Error consultant dades: {e}", run_log.ERROR)
+        return None
+
+def scrape_meteocat_data(url, station_name, previous=None, entry=None):
+    """Extreu TOTES les dades disponibles de cada estació - VERSIÓ MILLORADA
+    
+    `entry` és l'entrada de l'estació a la instantània d'observacions. Si no
+    es passa, es descarrega la pàgina i només s'extreu l'últim període
+    (scrape_latest_observation). Si `previous` es va extreure d'aquesta
+    mateixa pàgina (mateix hash), es retorna `previous` directament.
+    """
+    if entry is None:
+        return scrape_latest_observation(url, station_name, previous)
+    
+    try:
+        if entry.get('error'):
+            write_log(f"❌ Error consultant dades: {entry['error']}", run_log.ERROR)
             return None
         
-        # Primer, obtenim els noms de les columnes (capçaleres)
-        headers_row = rows[0]
-        columnes = []
-        for cell in headers_row.find_all(['td', 'th']):
-            text = cell.get_text(strip=True)
-            columnes.append(text)
+        if pagina_processada(previous, entry.get('sha256')):
+            write_log(f"♻️  {station_name}: pàgina sense canvis, no cal parsejar")
+            return previous
         
-        write_log(f"📋 Columnes detectades ({len(columnes)}):")
-        for idx, col in enumerate(columnes):
-            write_log(f"   [{idx}] {col}")
+        rows = entry['rows']
+        write_log(f"📊 {len(rows) + 1} files trobades")
         
-        # Mapeig MILLORAT de columnes a claus de dades
-        columna_mapping = {}
+        if len(rows) < 1:
+            write_log("❌ Taula massa curta per tenir dades", run_log.ERROR)
+            return None
         
-        for idx, col_name in enumerate(columnes):
-            col_name_lower = col_name.lower()
-            
-            # Període - sempre és la primera columna
-            if idx == 0:
-                columna_mapping['periode'] = idx
-                continue
-            
-            # Temperatura TM
-            if ('tm' in col_name_lower or 'mitjana' in col_name_lower) and ('°c' in col_name or 'c' in col_name_lower):
-                columna_mapping['tm'] = idx
-            # Temperatura TX
-            elif ('tx' in col_name_lower or 'màxima' in col_name_lower or 'maxima' in col_name_lower) and ('°c' in col_name or 'c' in col_name_lower):
-                columna_mapping['tx'] = idx
-            # Temperatura TN
-            elif ('tn' in col_name_lower or 'mínima' in col_name_lower or 'minima' in col_name_lower) and ('°c' in col_name or 'c' in col_name_lower):
-                columna_mapping['tn'] = idx
-            # Humitat
-            elif ('hrm' in col_name_lower or 'hr' in col_name_lower or 'humitat' in col_name_lower or 'humidity' in col_name_lower) and ('%' in col_name):
-                columna_mapping['hr'] = idx
-            # Precipitació
-            elif ('ppt' in col_name_lower or 'precipitació' in col_name_lower or 'precipitacio' in col_name_lower or 
-                  'pluja' in col_name_lower or 'precipitation' in col_name_lower) and ('mm' in col_name):
-                columna_mapping['ppt'] = idx
-            # Gruix de neu (GN)
-            elif ('gn' in col_name_lower or 'neu' in col_name_lower or 'snow' in col_name_lower or 'gruix' in col_name_lower) and ('cm' in col_name):
-                columna_mapping['gn'] = idx
-            # Vent mitjà (VVM)
-            elif ('vvm' in col_name_lower or ('vent' in col_name_lower and 'mitj' in col_name_lower) or 
-                  'wind' in col_name_lower) and ('km/h' in col_name or 'km' in col_name_lower):
-                columna_mapping['vvm'] = idx
-            # Direcció vent (DVM)
-            elif ('dvm' in col_name_lower or 'direcció' in col_name_lower or 'direccio' in col_name_lower or 
-                  'direction' in col_name_lower) and ('graus' in col_name_lower or '°' in col_name or 'degrees' in col_name_lower):
-                columna_mapping['dvm'] = idx
-            # Vent màxim (VVX)
-            elif ('vvx' in col_name_lower or ('vent' in col_name_lower and 'màx' in col_name_lower) or 
-                  'max' in col_name_lower) and ('km/h' in col_name or 'km' in col_name_lower):
-                columna_mapping['vvx'] = idx
-            # Pressió (PM)
-            elif ('pm' in col_name_lower or 'pressió' in col_name_lower or 'pressio' in col_name_lower or 
-                  'pressure' in col_name_lower) and ('hpa' in col_name_lower or 'hpa' in col_name):
-                columna_mapping['pm'] = idx
-            # Radiació solar (RS)
-            elif ('rs' in col_name_lower or 'radiació' in col_name_lower or 'radiacio' in col_name_lower or 
-                  'radiation' in col_name_lower) and ('w/m²' in col_name_lower or 'w/m2' in col_name_lower):
-                columna_mapping['rs'] = idx
-        
-        # Si no hem trobat algunes columnes bàsiques, fem un mapeig per posició
-        if 'tm' not in columna_mapping and len(columnes) > 1:
-            # Suposem que TM és la segona columna (índex 1) si conté °C
-            if len(columnes) > 1 and '°c' in columnes[1]:
-                columna_mapping['tm'] = 1
-        
-        write_log(f"🔍 Mapeig de columnes: {columna_mapping}")
+        # Noms de les columnes (capçaleres) i esquema compilat
+        schema = xema_schema.compile_schema(entry['header'])
+        log_columnes(entry['header'], schema.columns)
         
         # Busquem des del FINAL (dades més recents)
-        for i in range(len(rows)-1, 0, -1):
-            cells = rows[i].find_all(['td', 'th'])
-            
-            if len(cells) < 2:  # Almenys període i una dada
-                continue
-                
-            periode = cells[0].get_text(strip=True)
-            
-            if re.match(r'\d{1,2}:\d{2}\s*-\s*\d{1,2}:\d{2}', periode):
-                # Inicialitzem dades
-                dades_extretes = {
-                    'station_name': station_name,
-                    'station_code': url.split('codi=')[1][:2] if 'codi=' in url else '',
-                    'periode': periode
-                }
-                
-                # Processem cada columna mapejada
-                for key, col_idx in columna_mapping.items():
-                    if col_idx < len(cells):
-                        valor = cells[col_idx].get_text(strip=True)
-                        # No processem 'periode' ja que ja el tenim
-                        if key != 'periode':
-                            dades_extretes[key] = convertir_a_numero(valor)
-                
-                # Netegem les dades que no existeixen (valor None)
-                dades_finales = {k: v for k, v in dades_extretes.items() if v is not None}
-                
-                write_log(f"✅ Dades RECENTS trobades: {periode}")
-                write_log("📊 Dades extretes:")
-                for key, value in dades_finales.items():
-                    if key not in ['station_name', 'station_code', 'periode']:
-                        write_log(f"   • {key}: {value}")
-                
-                # Verifiquem que tenim dades suficients
-                if len([k for k in dades_finales.keys() if k not in ['station_name', 'station_code', 'periode']]) > 0:
-                    return dades_finales
-                else:
-                    write_log("⚠️  Dades insuficients, buscant més...")
-        
-        write_log("❌ No s'han trobat dades vàlides")
-        return None
+        dades = buscar_dades_recents(reversed(rows), schema, station_name, url)
+        if dades:
+            dades['source_sha256'] = entry.get('sha256')
+        return dades
         
     except Exception as e:
-        write_log(f"❌ Error consultant dades: {e}")
+        write_log(f"❌ Error consultant dades: {e}", run_log.ERROR)
         return None
 
-def convertir_a_numero(text, default=None):
-    """Converteix text a número, retorna None si no és vàlid"""
-    if not text or text in ['(s/d)', '-', '']:
-        return None
-    try:
-        return float(text.replace(',', '.'))
-    except:
-        return None
-
-def convertir_hora_tu_a_local(hora_tu_str):
-    """Converteix hora TU (UTC) a hora local (CET/CEST) - VERSIÓ AMB HORARI D'ESTIU"""
+def convertir_hora_tu_a_local(hora_tu_str, now=None):
+    """Converteix hora TU (UTC) a hora local (CET/CEST) segons la data del període"""
     if not hora_tu_str:
         return hora_tu_str
-    
     try:
-        # Netejar
-        hora_tu_str = re.sub(r'\s+', ' ', hora_tu_str.strip())
-        
-        # Trobar separador
-        separador = '-' if '-' in hora_tu_str else '–' if '–' in hora_tu_str else None
-        if not separador:
-            return hora_tu_str
-        
-        parts = hora_tu_str.split(separador)
-        if len(parts) != 2:
-            return hora_tu_str
-        
-        # Obtenir la data actual en UTC per saber si és CET o CEST
-        utc_now = datetime.now(pytz.utc)
-        local_tz = pytz.timezone('Europe/Madrid')
-        local_now = utc_now.astimezone(local_tz)
-        
-        # Calcular offset de l'hora local respecte UTC (en hores)
-        offset_hours = int(local_now.utcoffset().total_seconds() / 3600)
-        
-        def convertir_hora(hora):
-            hora = hora.strip()
-            if ':' in hora:
-                try:
-                    h_str, m_part = hora.split(':', 1)
-                    # Agafar només els dos primers dígits dels minuts
-                    m_str = m_part[:2] if len(m_part) >= 2 else '00'
-                    
-                    h = int(h_str)
-                    m = int(m_str) if m_str.isdigit() else 0
-                    
-                    # Sumar l'offset actual (1 per CET, 2 per CEST)
-                    h_local = h + offset_hours
-                    if h_local >= 24:
-                        h_local -= 24
-                    
-                    return f"{h_local:02d}:{m:02d}"
-                except:
-                    return hora
-            return hora
-        
-        inicio = convertir_hora(parts[0])
-        fin = convertir_hora(parts[1])
-        
-        resultat = f"{inicio} - {fin}"
-        return resultat
-    
+        return local_time.period_to_local(hora_tu_str, now)
     except Exception as e:
-        write_log(f"⚠️  Error conversió hora: {e}")
+        write_log(f"⚠️  Error conversió hora: {e}", run_log.WARNING)
         return hora_tu_str
 
 def llegir_dades_guardades():
@@ -229,16 +182,24 @@ def llegir_dades_guardades():
         else:
             return {}
     except Exception as e:
-        write_log(f"⚠️ Error llegint dades guardades: {e}")
+        write_log(f"⚠️ Error llegint dades guardades: {e}", run_log.WARNING)
         return {}
 
 def guardar_dades(dades_estacions):
     """Guarda les dades de totes les estacions"""
     try:
-        with open('weather_data.json', 'w', encoding='utf-8') as f:
-            json.dump(dades_estacions, f, ensure_ascii=False, indent=2)
+        artifacts.write_json('weather_data.json', dades_estacions, ensure_ascii=False, indent=2)
     except Exception as e:
-        write_log(f"⚠️ Error guardant dades: {e}")
+        write_log(f"⚠️ Error guardant dades: {e}", run_log.WARNING)
+
+def hora_rss_anterior():
+    """lastBuildDate del meteo.rss ja publicat (datetime UTC), o None"""
+    try:
+        with open('meteo.rss', 'r', encoding='utf-8') as f:
+            match = re.search(r'<lastBuildDate>([^<]+)</lastBuildDate>', f.read())
+        return parsedate_to_datetime(match.group(1)) if match else None
+    except (OSError, TypeError, ValueError):
+        return None
 
 def create_rss_feed():
     """Crea l'arxiu RSS amb totes les dades - VERSIÓ CORREGIDA (Llegendes completes)"""
@@ -246,27 +207,11 @@ def create_rss_feed():
     write_log("\n🚀 GENERADOR RSS METEOCAT - DEFINITIU")
     write_log("=" * 60)
     
-    stations = [
-        {
-            'name': 'Girona',
-            'code': 'XJ',
-            'url': 'https://www.meteo.cat/observacions/xema/dades?codi=XJ'
-        },
-        {
-            'name': 'Fornells de la Selva',
-            'code': 'UO',
-            'url': 'https://www.meteo.cat/observacions/xema/dades?codi=UO'
-        }
-    ]
-
+    stations = STATIONS
     
     # 🕐 CORRECCIÓ DEFINITIVA: Utilitzar UTC per a les dates del RSS
     # Això evita problemes amb futurs temps a GitHub Actions
-    utc_now = datetime.now(pytz.utc)
-    # Hora per mostrar al text (hora local d'Espanya)
-    display_tz = pytz.timezone('Europe/Madrid')
-    display_time = utc_now.astimezone(display_tz)
-    # --------------------------------------------------------
+    utc_now = local_time.now_utc()
     
     # Llegim les dades guardades de totes les estacions
     dades_estacions = llegir_dades_guardades()
@@ -274,16 +219,67 @@ def create_rss_feed():
     
     dades_actualitzades = {}
     
+    # Instantània compartida: si daily_weather_scraper ja ha descarregat i
+    # parsejat les estacions en aquesta execució, la reutilitzem
+    snapshot = observation_snapshot.load_fresh_snapshot() or {}
+    entries = {code: entry for code, entry in snapshot.get('stations', {}).items()
+               if entry.get('rows') is not None}
+    
+    # La resta d'estacions: només l'últim període, en paral·lel, i només
+    # les que ja poden tenir un període nou (consulta adaptativa)
+    polling = adaptive_polling.PollingState()
+    pendents = [s for s in stations if s['code'] not in entries]
+    pendents, en_espera = polling.split(pendents)
+    # Sense dades guardades no hi ha res a mantenir: es descarrega igualment
+    pendents += [s for s in en_espera if s['code'] not in dades_estacions]
+    en_espera = [s for s in en_espera if s['code'] in dades_estacions]
+    write_log(f"\n📡 Instantània: {len(entries)} estacions | "
+              f"Descàrrega ràpida: {len(pendents)} estacions | "
+              f"Sense període nou previst: {len(en_espera)} estacions")
+    recents = dict(zip(
+        [s['code'] for s in pendents],
+        fetch_stations(
+            pendents,
+            lambda station: scrape_latest_observation(station['url'], station['name'],
+                                                      previous=dades_estacions.get(station['code']))
+        )
+    ))
+    for station in pendents:
+        dades = recents[station['code']]
+        if dades is None:
+            polling.record(station, error=True)
+        elif dades is dades_estacions.get(station['code']):
+            polling.record(station)
+        else:
+            polling.record(station, dades.get('periode'))
+    # Les estacions en espera mantenen les dades guardades
+    recents.update({s['code']: dades_estacions[s['code']] for s in en_espera})
+    if pendents:
+        try:
+            polling.save()
+        except Exception as e:
+            write_log(f"⚠️ Error guardant l'estat de consulta: {e}", run_log.WARNING)
+    
+    per_convertir = []
     for station in stations:
         write_log(f"\n{'='*60}")
         write_log(f"📡 Processant: {station['name']} [{station['code']}]")
         
-        dades = scrape_meteocat_data(station['url'], station['name'])
+        if station['code'] in entries:
+            dades = scrape_meteocat_data(station['url'], station['name'],
+                                         previous=dades_estacions.get(station['code']),
+                                         entry=entries[station['code']])
+        else:
+            dades = recents.get(station['code'])
         
-        if dades:
-            # Convertir hora TU a local
+        if dades is not None and dades is dades_estacions.get(station['code']):
+            # Pàgina sense canvis: les dades guardades ja tenen l'hora local
+            dades_actualitzades[station['code']] = dades
+            write_log(f"♻️ {station['name']} - sense canvis")
+        elif dades:
+            # L'hora TU es converteix a local més avall, totes d'un cop
             if 'periode' in dades:
-                dades['periode'] = convertir_hora_tu_a_local(dades['periode'])
+                per_convertir.append(dades)
             
             dades_actualitzades[station['code']] = dades
             write_log(f"✅ {station['name']} actualitzada")
@@ -291,13 +287,45 @@ def create_rss_feed():
             # Si no podem obtenir dades noves, mantenim les antigues
             if station['code'] in dades_estacions:
                 dades_actualitzades[station['code']] = dades_estacions[station['code']]
-                write_log(f"⚠️ {station['name']} - mantenint dades antigues")
+                write_log(f"⚠️ {station['name']} - mantenint dades antigues", run_log.WARNING)
             else:
-                write_log(f"❌ {station['name']} - sense dades")
+                write_log(f"❌ {station['name']} - sense dades", run_log.ERROR)
+    
+    # Convertir hora TU a local de tots els períodes nous (cada un amb el
+    # desplaçament CET/CEST del seu propi instant)
+    if per_convertir:
+        try:
+            # Instant UTC del final de cada període (hora de les dades)
+            for dades in per_convertir:
+                observat = local_time.period_end_utc(dades['periode'], utc_now)
+                if observat:
+                    dades['observed_utc'] = observat.isoformat()
+            periodes_locals = local_time.periods_to_local([d['periode'] for d in per_convertir], utc_now)
+            for dades, periode in zip(per_convertir, periodes_locals):
+                dades['periode'] = periode
+        except Exception as e:
+            write_log(f"⚠️  Error conversió hora: {e}", run_log.WARNING)
+    
+    # Magnituds derivades (punt de rosada, sensació tèrmica...) de totes les
+    # estacions d'un sol cop (NumPy només es carrega aquí)
+    import derived_metrics
+    derived_metrics.add_derived(list(dades_actualitzades.values()))
     
     # Actualitzem les dades guardades
     guardar_dades(dades_actualitzades)
     
+    # Hora del feed: la del període més recent, no la del rellotge. Amb les
+    # mateixes dades el RSS surt idèntic i artifacts no el reescriu
+    observats = [d['observed_utc'] for d in dades_actualitzades.values() if d.get('observed_utc')]
+    # Sense cap hora de dades (p. ex. weather_data.json d'una versió anterior)
+    # es manté la del RSS anterior; el rellotge només el primer cop
+    if observats:
+        feed_time = datetime.fromisoformat(max(observats))
+    else:
+        feed_time = hora_rss_anterior() or utc_now
+    # Hora per mostrar al text (hora local d'Espanya)
+    display_time = local_time.to_local(feed_time)
+    
     # Generem les entrades RSS per cada estació
     entrades = []
     
@@ -322,9 +350,16 @@ def create_rss_feed():
         if 'tn' in dades and dades['tn'] is not None:
             parts_cat.append(f"❄️ Temp. Mínima: {dades['tn']}°C")
         
+        # Sensació tèrmica només quan difereix de la temperatura (fred o calor)
+        if 'feels_like' in dades and ('wind_chill' in dades or 'heat_index' in dades):
+            parts_cat.append(f"🌡️ Sensació tèrmica: {dades['feels_like']}°C")
+        
         if 'hr' in dades and dades['hr'] is not None:
             parts_cat.append(f"💧 Humitat: {dades['hr']}%")
         
+        if 'dew_point' in dades:
+            parts_cat.append(f"🌫️ Punt de rosada: {dades['dew_point']}°C")
+        
         if 'ppt' in dades and dades['ppt'] is not None:
             parts_cat.append(f"🌧️ Precipitació: {dades['ppt']}mm")
         
@@ -372,9 +407,15 @@ def create_rss_feed():
         if 'tn' in dades and dades['tn'] is not None:
             parts_en.append(f"❄️ Min Temp: {dades['tn']}°C")
         
+        if 'feels_like' in dades and ('wind_chill' in dades or 'heat_index' in dades):
+            parts_en.append(f"🌡️ Feels like: {dades['feels_like']}°C")
+        
         if 'hr' in dades and dades['hr'] is not None:
             parts_en.append(f"💧 Humidity: {dades['hr']}%")
         
+        if 'dew_point' in dades:
+            parts_en.append(f"🌫️ Dew point: {dades['dew_point']}°C")
+        
         if 'ppt' in dades and dades['ppt'] is not None:
             parts_en.append(f"🌧️ Precipitation: {dades['ppt']}mm")
         
@@ -409,7 +450,7 @@ def create_rss_feed():
     <title>{titol}</title>
     <link>https://www.meteo.cat/observacions/xema/dades?codi={dades.get('station_code', station_code)}</link>
     <description>Dades meteorològiques de {dades['station_name']} / Weather data from {dades['station_name']} - Actualitzat el {display_time.strftime("%d/%m/%Y a les %H:%M")} / Updated on {display_time.strftime("%d/%m/%Y at %H:%M")}</description>
-    <pubDate>{utc_now.strftime("%a, %d %b %Y %H:%M:%S +0000")}</pubDate>
+    <pubDate>{feed_time.strftime("%a, %d %b %Y %H:%M:%S +0000")}</pubDate>
   </item>'''
         
         entrades.append(entrada)
@@ -424,23 +465,22 @@ def create_rss_feed():
   <title>Dades Meteo Locals Completes</title>
   <link>https://www.meteo.cat</link>
   <description>Dades meteorològiques en temps real - Estacions Girona / Real-time weather data - Girona station</description>
-  <lastBuildDate>{utc_now.strftime("%a, %d %b %Y %H:%M:%S +0000")}</lastBuildDate>
+  <lastBuildDate>{feed_time.strftime("%a, %d %b %Y %H:%M:%S +0000")}</lastBuildDate>
 {chr(10).join(entrades)}
 </channel>
 </rss>'''
     
     # Guardar RSS
     try:
-        with open('meteo.rss', 'w', encoding='utf-8') as f:
-            f.write(rss_content)
+        changed = artifacts.write_text('meteo.rss', rss_content)
         
         print(f"\n{'='*60}")
-        print(f"✅ RSS generat amb {len(entrades)} estacions")
-        print(f"🕐 UTC: {utc_now.strftime('%H:%M:%S')} | Local (CAT): {display_time.strftime('%H:%M:%S')}")
+        print(f"✅ RSS generat amb {len(entrades)} estacions" + ("" if changed else " (sense canvis, no s'ha reescrit)"))
+        print(f"🕐 Dades fins a UTC: {feed_time.strftime('%H:%M')} | Local (CAT): {display_time.strftime('%H:%M')}")
         
         # Mostrar resum
         for station_code, dades in dades_actualitzades.items():
-            print(f"   • {dades['station_name']}: {len([k for k in dades.keys() if k not in ['station_name', 'station_code', 'periode']])} dades | {dades.get('periode', 'N/D')}")
+            print(f"   • {dades['station_name']}: {len([k for k in dades.keys() if k not in ['station_name', 'station_code', 'periode', 'observed_utc', 'source_sha256']])} dades | {dades.get('periode', 'N/D')}")
         
         # Mostrar contingut del RSS
         print(f"\n📄 CONTINGUT meteo.rss:")
@@ -456,7 +496,7 @@ def create_rss_feed():
         return True
         
     except Exception as e:
-        write_log(f"❌ Error guardant RSS: {e}")
+        write_log(f"❌ Error guardant RSS: {e}", run_log.ERROR)
         return False
 
 def setup_automatic_update():
@@ -480,8 +520,7 @@ def setup_automatic_update():
 
 if __name__ == "__main__":
     # Netejar log anterior
-    with open('debug.log', 'w', encoding='utf-8') as f:
-        f.write(f"=== INICI: {datetime.now(pytz.utc).strftime('%Y-%m-%d %H:%M:%S UTC')} ===\n")
+    reset_log()
     
     try:
         exit_code = create_rss_feed()
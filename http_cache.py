@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# http_cache.py - MEMÒRIA CAU HTTP EN DISC (ETag / If-Modified-Since)
+# Cada URL es guarda a data/http_cache/ amb el cos i els validadors
+# (ETag, Last-Modified, hash del cos). Les peticions següents són
+# condicionals. La memòria cau és compartida per tots els scripts: per
+# saber si es pot saltar el parseig, cada consumidor compara `sha256` amb
+# el hash de l'última pàgina que ell mateix va processar (`not_modified`
+# només diu que el cos és el de l'última descàrrega, feta per qui sigui).
+
+import hashlib
+import json
+import os
+import time
+
+import http_client
+
+CACHE_DIR = os.path.join('data', 'http_cache')
+
+
+class CachedResponse:
+    """Resposta servida per la memòria cau (o descarregada i desada)"""
+
+    def __init__(self, url, content, status_code, not_modified, from_cache, meta):
+        self.url = url
+        self.content = content
+        self.status_code = status_code
+        # True si el cos és idèntic al de l'última descàrrega (de qualsevol
+        # script): per saltar-se el parseig, compareu `sha256` amb el propi
+        self.not_modified = not_modified
+        # True si no s'ha fet cap petició (entrada encara fresca)
+        self.from_cache = from_cache
+        self.etag = meta.get('etag')
+        self.last_modified = meta.get('last_modified')
+        self.sha256 = meta.get('sha256')
+        self.fetched_at = meta.get('fetched_at')
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+
+def _paths(url, cache_dir):
+    key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    base = os.path.join(cache_dir, key)
+    return base + '.json', base + '.body'
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _load(url, cache_dir):
+    """Llegeix l'entrada de la memòria cau (meta, cos) o (None, None)"""
+    meta_path, body_path = _paths(url, cache_dir)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(body_path, 'rb') as f:
+            body = f.read()
+    except (OSError, ValueError):
+        return None, None
+    if meta.get('url') != url or hashlib.sha256(body).hexdigest() != meta.get('sha256'):
+        return None, None
+    return meta, body
+
+
+def _save_meta(url, meta, cache_dir):
+    meta_path, _ = _paths(url, cache_dir)
+    _write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+
+def fetch(url, max_age=0, cache_dir=CACHE_DIR, **kwargs):
+    """
+    GET amb memòria cau persistent
+
+    - Si l'entrada té menys de `max_age` segons, no es fa cap petició.
+    - Si no, s'envia una petició condicional (If-None-Match / If-Modified-Since).
+    - Una resposta 304, o un cos amb el mateix hash, es marca com `not_modified`.
+
+    Els arguments extra (timeout, deadline, retries) van a http_client.get.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    meta, body = _load(url, cache_dir)
+    now = time.time()
+
+    if meta and max_age > 0 and now - meta.get('checked_at', 0) < max_age:
+        return CachedResponse(url, body, 200, True, True, meta)
+
+    headers = {}
+    if meta:
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    response = http_client.get(url, headers=headers or None, **kwargs)
+
+    if response.status_code == 304 and meta:
+        meta['checked_at'] = now
+        _save_meta(url, meta, cache_dir)
+        return CachedResponse(url, body, 304, True, False, meta)
+
+    content = response.content
+    sha256 = hashlib.sha256(content).hexdigest()
+    not_modified = bool(meta) and meta.get('sha256') == sha256
+
+    new_meta = {
+        'url': url,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'sha256': sha256,
+        'size': len(content),
+        'fetched_at': meta['fetched_at'] if not_modified else now,
+        'checked_at': now,
+    }
+    if not not_modified:
+        _write_atomic(_paths(url, cache_dir)[1], content)
+    _save_meta(url, new_meta, cache_dir)
+
+    return CachedResponse(url, content, response.status_code, not_modified, False, new_meta)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# http_client.py - CLIENT HTTP COMPARTIT (meteo.cat i NOAA)
+# Una sola sessió requests amb connexions persistents (keep-alive),
+# reintents limitats amb espera aleatòria (jitter), termini total per
+# petició i compressió gzip.
+# requests s'importa la primera vegada que es fa una petició: les etapes
+# que no descarreguen res no en paguen el cost d'importació.
+
+import random
+import threading
+import time
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Temps màxim de connexió i de lectura de cada intent (segons)
+DEFAULT_TIMEOUT = (5, 15)
+# Termini total de la petició, reintents inclosos (segons)
+DEFAULT_DEADLINE = 30
+
+# Reintents
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5   # segons
+BACKOFF_MAX = 8.0    # segons
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Mida del pool de connexions per host
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 8
+
+CHUNK_SIZE = 64 * 1024
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Retorna la sessió compartida (es crea la primera vegada)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            # Els reintents els gestionem nosaltres (amb jitter i termini)
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS,
+                                  pool_maxsize=POOL_MAXSIZE,
+                                  max_retries=0)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({
+                'User-Agent': USER_AGENT,
+                'Accept-Encoding': 'gzip, deflate',
+                'Connection': 'keep-alive',
+            })
+            _session = session
+        return _session
+
+
+def close_session():
+    """Tanca la sessió compartida i les seves connexions"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+class _RetryableStatus(Exception):
+    """Resposta HTTP que s'ha de reintentar (429/5xx)"""
+
+    def __init__(self, response, wait=None):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+        self.status_code = response.status_code
+        self.wait = wait
+
+    def http_error(self):
+        """L'error públic (requests.HTTPError amb la resposta) per als cridadors"""
+        import requests
+
+        return requests.HTTPError(f"{self.status_code} per {self.response.url}",
+                                  response=self.response)
+
+
+def _backoff(attempt):
+    """Espera exponencial amb jitter complet"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _retry_after(response):
+    """Segons indicats per la capçalera Retry-After (si és numèrica)"""
+    value = response.headers.get('Retry-After', '')
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def _read_body(response, limit):
+    """Llegeix el cos de la resposta sense passar del termini"""
+    import requests
+
+    chunks = []
+    for chunk in response.iter_content(CHUNK_SIZE):
+        if time.monotonic() > limit:
+            response.close()
+            raise requests.Timeout(f"Termini esgotat llegint {response.url}")
+        chunks.append(chunk)
+    # Deixem la resposta com si s'hagués descarregat sense stream
+    response._content = b''.join(chunks)
+    response._content_consumed = True
+    return response
+
+
+def get(url, headers=None, timeout=DEFAULT_TIMEOUT, deadline=DEFAULT_DEADLINE,
+        retries=MAX_RETRIES):
+    """
+    GET amb la sessió compartida
+
+    Reintenta errors de connexió, timeouts i respostes 429/5xx fins a
+    `retries` vegades, sense superar mai el termini total `deadline`.
+    Retorna la resposta amb el contingut ja descarregat (raise_for_status aplicat).
+    """
+    import requests
+
+    session = get_session()
+    limit = time.monotonic() + deadline
+    connect_timeout, read_timeout = timeout
+    attempt = 0
+
+    while True:
+        remaining = limit - time.monotonic()
+        if remaining <= 0:
+            raise requests.Timeout(f"Termini de {deadline}s esgotat per {url}")
+
+        try:
+            response = session.get(
+                url,
+                headers=headers,
+                timeout=(min(connect_timeout, remaining), min(read_timeout, remaining)),
+                stream=True,
+            )
+            if response.status_code in RETRY_STATUS and attempt < retries:
+                wait = _retry_after(response)
+                response.close()
+                raise _RetryableStatus(response, wait)
+
+            response.raise_for_status()
+            return _read_body(response, limit)
+
+        except (requests.ConnectionError, requests.Timeout,
+                requests.exceptions.ChunkedEncodingError, _RetryableStatus) as e:
+            if attempt >= retries:
+                raise
+            wait = getattr(e, 'wait', None)
+            if wait is None:
+                wait = _backoff(attempt)
+            if wait >= limit - time.monotonic():
+                # No queda temps per reintentar. Els cridadors només coneixen
+                # les excepcions de requests: 429/5xx surten com a HTTPError
+                if isinstance(e, _RetryableStatus):
+                    raise e.http_error() from e
+                raise
+            time.sleep(wait)
+            attempt += 1
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# local_time.py - ZONA HORÀRIA LOCAL (Europe/Madrid)
+# Un sol objecte zoneinfo (biblioteca estàndard) compartit per tots els
+# scripts, en lloc de cridar pytz.timezone() a cada conversió.
+#
+# Conversió de períodes XEMA ('HH:MM - HH:MM' en hora TU) a hora local:
+# - cada text de període es parseja una sola vegada (minuts UTC del dia)
+# - el desplaçament de cada període surt d'una taula de transicions
+#   (CET/CEST) precalculada per any, de manera que els períodes a banda i
+#   banda d'un canvi d'hora es converteixen cadascun amb el seu desplaçament
+#   (no amb el de l'hora actual)
+
+import bisect
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+import period_index
+
+LOCAL_TZ_NAME = 'Europe/Madrid'
+LOCAL_TZ = ZoneInfo(LOCAL_TZ_NAME)
+
+MINUTES_PER_DAY = 24 * 60
+
+HHMM_RE = re.compile(r'(\d{1,2}):(\d{2})')
+
+
+def now_utc():
+    """Hora actual en UTC (amb zona)"""
+    return datetime.now(timezone.utc)
+
+
+def to_local(dt):
+    """Converteix un datetime a hora local (sense zona = UTC)"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(LOCAL_TZ)
+
+
+# ---------------------------------------------------------------------------
+# Taula de transicions
+# ---------------------------------------------------------------------------
+
+def _epoch_minutes(dt):
+    return int(dt.timestamp()) // 60
+
+
+def _offset_minutes(epoch_minutes):
+    instant = datetime.fromtimestamp(epoch_minutes * 60, timezone.utc)
+    return int(instant.astimezone(LOCAL_TZ).utcoffset().total_seconds()) // 60
+
+
+@lru_cache(maxsize=8)
+def transition_table(year):
+    """
+    Transicions d'un any: (minuts UTC des de 1970 de cada canvi, desplaçaments en minuts)
+
+    La primera entrada és l'1 de gener a les 00:00 UTC. Es busca dia a dia
+    i, quan el desplaçament canvia, el minut exacte per bisecció.
+    """
+    start = _epoch_minutes(datetime(year, 1, 1, tzinfo=timezone.utc))
+    end = _epoch_minutes(datetime(year + 1, 1, 1, tzinfo=timezone.utc))
+    instants = [start]
+    offsets = [_offset_minutes(start)]
+    day = start
+    while day < end:
+        next_day = min(day + MINUTES_PER_DAY, end)
+        offset = _offset_minutes(next_day)
+        if offset != offsets[-1]:
+            low, high = day, next_day
+            while high - low > 1:
+                middle = (low + high) // 2
+                if _offset_minutes(middle) == offsets[-1]:
+                    low = middle
+                else:
+                    high = middle
+            instants.append(high)
+            offsets.append(offset)
+        day = next_day
+    return tuple(instants), tuple(offsets)
+
+
+def utc_offset_minutes(epoch_minutes):
+    """Desplaçament local (minuts) en un instant UTC donat en minuts des de 1970"""
+    year = datetime.fromtimestamp(epoch_minutes * 60, timezone.utc).year
+    instants, offsets = transition_table(year)
+    return offsets[bisect.bisect_right(instants, epoch_minutes) - 1]
+
+
+# ---------------------------------------------------------------------------
+# Períodes
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=512)
+def parse_period(text):
+    """'HH:MM - HH:MM' → (inici, final) en minuts UTC del dia, o None
+
+    Si el final és anterior o igual a l'inici (p. ex. '23:30 - 00:00') el
+    període acaba l'endemà: el final es retorna sumant-hi 24 hores.
+    """
+    match = period_index.PERIOD_RE.search(text or '')
+    if not match:
+        return None
+    h1, m1, h2, m2 = (int(g) for g in match.groups())
+    start = h1 * 60 + m1
+    end = h2 * 60 + m2
+    if end <= start:
+        end += MINUTES_PER_DAY
+    return start, end
+
+
+def _format_minutes(minutes):
+    minutes %= MINUTES_PER_DAY
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def period_day(period, now=None):
+    """Minuts UTC (des de 1970) de la mitjanit del dia de la pàgina per a un període
+
+    La pàgina XEMA mostra el dia en curs; just després de mitjanit, un
+    període que acabaria en el futur és encara del dia anterior.
+    """
+    now = now or now_utc()
+    midnight = _epoch_minutes(now.replace(hour=0, minute=0, second=0, microsecond=0))
+    if midnight + period[1] > _epoch_minutes(now) + 30:
+        midnight -= MINUTES_PER_DAY
+    return midnight
+
+
+def periods_to_local(periods, now=None):
+    """
+    Converteix una sèrie de períodes en hora TU a hora local ('HH:MM - HH:MM')
+
+    Cada període es converteix amb el desplaçament del seu instant d'inici
+    (així els dos extrems queden a 30 minuts fins i tot en el canvi d'hora).
+    Els textos que no són períodes es retornen només amb els espais netejats.
+    """
+    now = now or now_utc()
+    result = []
+    for text in periods:
+        period = parse_period(text)
+        if period is None:
+            result.append(re.sub(r'\s+', ' ', (text or '').strip()) if text else text)
+            continue
+        offset = utc_offset_minutes(period_day(period, now) + period[0])
+        result.append(f"{_format_minutes(period[0] + offset)} - {_format_minutes(period[1] + offset)}")
+    return result
+
+
+def period_to_local(text, now=None):
+    """Un sol període en hora TU a hora local"""
+    return periods_to_local([text], now)[0]
+
+
+def hhmm_to_local(text, date=None):
+    """Hora 'HH:MM' UTC del dia `date` (AAAA-MM-DD, per defecte avui) a 'HH:MM' local, o None"""
+    match = HHMM_RE.fullmatch((text or '').strip())
+    if not match:
+        return None
+    day = datetime.strptime(date, '%Y-%m-%d').replace(tzinfo=timezone.utc) if date else \
+        now_utc().replace(hour=0, minute=0, second=0, microsecond=0)
+    minutes = int(match.group(1)) * 60 + int(match.group(2))
+    instant = _epoch_minutes(day) + minutes
+    return _format_minutes(minutes + utc_offset_minutes(instant))
+
+
+def period_end_utc(text, now=None):
+    """Instant UTC (datetime) del final d'un període en hora TU, o None"""
+    period = parse_period(text)
+    if period is None:
+        return None
+    return datetime.fromtimestamp((period_day(period, now) + period[1]) * 60, timezone.utc)
+
+
+def period_date(text, now=None):
+    """Data UTC ('AAAA-MM-DD') del dia de la pàgina per a un període en hora TU, o None"""
+    period = parse_period(text)
+    if period is None:
+        return None
+    return datetime.fromtimestamp(period_day(period, now) * 60, timezone.utc).strftime('%Y-%m-%d')
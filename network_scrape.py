@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# network_scrape.py - MODE XARXA SENCERA
+# Descarrega TOTES les estacions actives del registre en una sola execució:
+# - limitador de tipus "token bucket" contra meteo.cat (peticions/segon)
+# - pool de treballadors amb termini per estació
+# - termini global perquè tot càpiga dins la finestra del disparador (5 min)
+# - si una estació falla, es manté l'última dada bona (com fa el RSS)
+# - informe final d'èxits, dades antigues i errors
+#
+# Ús:
+#   python network_scrape.py [--rate 2] [--burst 4] [--workers 8]
+#                            [--timeout 20] [--window 270]
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import daily_weather_scraper
+import observation_snapshot
+import station_day
+import station_registry
+
+OUTPUT_FILE = os.path.join('data', 'network_latest.json')
+
+DEFAULT_RATE = 2.0       # peticions per segon a meteo.cat
+DEFAULT_BURST = 4        # peticions seguides permeses
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 20     # segons per estació
+DEFAULT_WINDOW = 270     # segons per a tota la xarxa (< 5 minuts)
+
+
+class TokenBucket:
+    """Limitador de ritme: `rate` fitxes per segon, com a màxim `capacity` acumulades"""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline=None):
+        """Espera una fitxa; retorna False si s'arriba a `deadline` (monotonic) abans"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+def load_previous(filename=OUTPUT_FILE):
+    """Resultats de l'última execució de xarxa (per a les dades antigues)"""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f).get('stations', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def scrape_station(station, bucket, timeout, window_deadline, previous):
+    """Descarrega i processa una estació; retorna (estat, entrada)"""
+    info = {'name': station['name'], 'code': station['code'], 'url': station['url']}
+
+    if not bucket.acquire(deadline=window_deadline):
+        status, periods, summary, error = 'failed', None, None, "Fora de la finestra de temps"
+    else:
+        deadline = min(timeout, max(0.0, window_deadline - time.monotonic()))
+        entry = observation_snapshot.fetch_entry(station['url'], station['code'], station['name'],
+                                                 deadline=deadline)
+        error = entry.get('error')
+        periods, summary = (None, None)
+        if not error:
+            periods, summary = daily_weather_scraper.scrape_all_today_data(
+                station['url'], station['name'], entry=entry)
+            if not (periods and summary):
+                error = "Sense dades vàlides"
+        status = 'ok' if not error else 'failed'
+
+    if status == 'failed' and previous and previous.get('summary'):
+        # Mantenim l'última dada bona, marcada com a antiga
+        return 'stale', dict(previous, status='stale', error=error,
+                             stale_since=previous.get('stale_since') or previous.get('fetched_at'))
+
+    return status, {
+        'info': info,
+        'status': status,
+        'error': error,
+        'fetched_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'periods': periods or [],
+        'summary': summary,
+    }
+
+
+def scrape_network(stations=None, rate=DEFAULT_RATE, burst=DEFAULT_BURST,
+                   workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT, window=DEFAULT_WINDOW,
+                   output=OUTPUT_FILE):
+    """Descarrega totes les estacions i retorna el resultat amb l'informe"""
+    if stations is None:
+        stations = station_registry.load_registry().enabled()
+
+    start = time.monotonic()
+    window_deadline = start + window
+    bucket = TokenBucket(rate, burst)
+    previous = load_previous(output)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='xarxa') as executor:
+        futures = [
+            executor.submit(scrape_station, station, bucket, timeout, window_deadline,
+                            previous.get(station['code']))
+            for station in stations
+        ]
+        results = [future.result() for future in futures]
+
+    report = {'ok': [], 'stale': [], 'failed': []}
+    network = {}
+    for station, (status, entry) in zip(stations, results):
+        report[status].append(station['code'])
+        network[station['code']] = entry
+
+    elapsed = time.monotonic() - start
+    data = {
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'report': {
+            'total': len(stations),
+            'ok': len(report['ok']),
+            'stale': report['stale'],
+            'failed': report['failed'],
+            'elapsed_s': round(elapsed, 1),
+        },
+        'stations': network,
+    }
+
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    tmp = f"{output}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'), default=station_day.json_default)
+    os.replace(tmp, output)
+
+    return data
+
+
+def print_report(data):
+    report = data['report']
+    print("\n" + "=" * 60)
+    print("📋 INFORME XARXA XEMA")
+    print("=" * 60)
+    print(f"   • Estacions: {report['total']}")
+    print(f"   • ✅ Correctes: {report['ok']}")
+    print(f"   • ⚠️  Dades antigues: {len(report['stale'])} {', '.join(report['stale'])}")
+    print(f"   • ❌ Errors: {len(report['failed'])} {', '.join(report['failed'])}")
+    print(f"   • ⏱️  Temps: {report['elapsed_s']}s")
+    print("=" * 60)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Descarrega tota la xarxa XEMA activa")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help="peticions per segon")
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST, help="ràfega màxima de peticions")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="treballadors simultanis")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="segons per estació")
+    parser.add_argument('--window', type=float, default=DEFAULT_WINDOW, help="segons per a tota la xarxa")
+    args = parser.parse_args(argv)
+
+    daily_weather_scraper.reset_log()
+    data = scrape_network(rate=args.rate, burst=args.burst, workers=args.workers,
+                          timeout=args.timeout, window=args.window)
+    print_report(data)
+    return data
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# observation_snapshot.py - INSTANTÀNIA D'OBSERVACIONS PER EXECUCIÓ
+# Cada estació es descarrega i es parseja UNA sola vegada per execució.
+# El resultat (files de la taula, capçalera, mapeig de columnes i dades de
+# la descàrrega) es guarda a data/observations_snapshot.json i el fan servir
+# tant daily_weather_scraper.py com generate_meteo_rss.py.
+
+import json
+import os
+from datetime import datetime, timezone
+
+import adaptive_polling
+import http_cache
+import xema_parser
+import xema_schema
+from station_fetcher import fetch_stations
+
+SNAPSHOT_FILE = os.path.join('data', 'observations_snapshot.json')
+
+# Una instantània més antiga que això es torna a generar (segons)
+SNAPSHOT_MAX_AGE = 240
+
+# Segons durant els quals una pàgina descarregada es considera fresca
+CACHE_MAX_AGE = 120
+
+# Backend de parseig de la taula (vegeu xema_parser.BACKENDS)
+PARSER_BACKEND = xema_parser.DEFAULT_BACKEND
+
+
+def parse_table(content, backend=None):
+    """Retorna les files de la taula tblperiode com a llistes de textos (o None)"""
+    return xema_parser.parse_table(content, backend or PARSER_BACKEND)
+
+
+def fetch_entry(url, code='', name='', previous_entry=None, deadline=None):
+    """
+    Descarrega i parseja una estació
+
+    Si la pàgina és idèntica a la de `previous_entry`, es reaprofiten les
+    seves files i no es torna a parsejar. `deadline` limita els segons
+    totals de la descàrrega (reintents inclosos).
+    """
+    entry = {
+        'code': code,
+        'name': name,
+        'url': url,
+        'fetched_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'not_modified': False,
+        'sha256': None,
+        'header': [],
+        'columns': {},
+        'rows': None,
+        'error': None,
+    }
+    try:
+        kwargs = {} if deadline is None else {'deadline': deadline}
+        response = http_cache.fetch(url, max_age=CACHE_MAX_AGE, **kwargs)
+        entry['not_modified'] = response.not_modified
+        entry['sha256'] = response.sha256
+
+        if (previous_entry and previous_entry.get('rows') is not None
+                and previous_entry.get('sha256') == response.sha256):
+            entry['header'] = previous_entry['header']
+            entry['columns'] = previous_entry['columns']
+            entry['rows'] = previous_entry['rows']
+            return entry
+
+        rows = parse_table(response.content)
+        if rows is None:
+            entry['error'] = "No s'ha trobat la taula tblperiode"
+        elif rows:
+            entry['header'] = rows[0]
+            entry['columns'] = xema_schema.compile_schema(rows[0]).columns
+            entry['rows'] = rows[1:]
+        else:
+            entry['rows'] = []
+    except Exception as e:
+        entry['error'] = str(e)
+    return entry
+
+
+def build_snapshot(stations, previous=None):
+    """Descarrega i parseja totes les estacions (en paral·lel)"""
+    previous_entries = (previous or {}).get('stations', {})
+    entries = fetch_stations(
+        stations,
+        lambda station: fetch_entry(station['url'], station['code'], station['name'],
+                                    previous_entries.get(station['code']))
+    )
+    snapshot = {
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'stations': {},
+    }
+    for station, entry in zip(stations, entries):
+        if entry is None:
+            entry = {'code': station['code'], 'name': station['name'], 'url': station['url'],
+                     'rows': None, 'error': 'Error desconegut'}
+        snapshot['stations'][station['code']] = entry
+    return snapshot
+
+
+# Última instantània llegida o escrita per aquest procés (mode dimoni):
+# {fitxer: (mtime_ns, instantània)}
+_memory = {}
+
+
+def load_snapshot(filename=SNAPSHOT_FILE):
+    """Llegeix la instantània guardada (o None); si no ha canviat, des de memòria"""
+    try:
+        mtime = os.stat(filename).st_mtime_ns
+    except OSError:
+        return None
+    cached = _memory.get(filename)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    _memory[filename] = (mtime, snapshot)
+    return snapshot
+
+
+def save_snapshot(snapshot, filename=SNAPSHOT_FILE):
+    """Guarda la instantània en JSON compacte"""
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    tmp = f"{filename}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp, filename)
+    _memory[filename] = (os.stat(filename).st_mtime_ns, snapshot)
+
+
+def snapshot_age(snapshot):
+    """Segons des que es va generar la instantània"""
+    try:
+        generated = datetime.fromisoformat(snapshot['generated_at'])
+    except (KeyError, TypeError, ValueError):
+        return float('inf')
+    return (datetime.now(timezone.utc) - generated).total_seconds()
+
+
+def load_fresh_snapshot(max_age=SNAPSHOT_MAX_AGE, filename=SNAPSHOT_FILE):
+    """Retorna la instantània guardada si té menys de `max_age` segons (o None)"""
+    snapshot = load_snapshot(filename)
+    if snapshot and snapshot_age(snapshot) <= max_age:
+        return snapshot
+    return None
+
+
+def record_polls(polling, stations, snapshot):
+    """Passa el resultat de cada estació descarregada a l'estat de consulta adaptativa"""
+    entries = snapshot.get('stations', {})
+    for station in stations:
+        entry = entries.get(station['code']) or {}
+        if entry.get('error') or entry.get('rows') is None:
+            polling.record(station, error=True)
+        else:
+            polling.record(station, adaptive_polling.latest_period(entry['rows']))
+
+
+def get_snapshot(stations, max_age=SNAPSHOT_MAX_AGE, filename=SNAPSHOT_FILE, polling=None):
+    """
+    Retorna una instantània que inclou totes les `stations`
+
+    Si la guardada és recent es reutilitza i només es descarreguen les
+    estacions que hi falten o que havien fallat. Si no, es regenera.
+
+    Amb `polling` (adaptive_polling.PollingState), en regenerar-la només es
+    descarreguen les estacions que ja poden tenir un període nou; la resta
+    conserven l'entrada de la instantània anterior.
+    """
+    snapshot = load_snapshot(filename)
+
+    if snapshot and snapshot_age(snapshot) <= max_age:
+        entries = snapshot.get('stations', {})
+        pending = [s for s in stations
+                   if entries.get(s['code'], {}).get('rows') is None]
+        if not pending:
+            print(f"📦 Instantània reutilitzada ({len(stations)} estacions)")
+            return snapshot
+        print(f"📦 Instantània parcial: descarregant {len(pending)} estacions")
+        fresh = build_snapshot(pending, previous=snapshot)
+        entries.update(fresh['stations'])
+    elif polling is not None:
+        previous_entries = (snapshot or {}).get('stations', {})
+        due, waiting = polling.split(stations)
+        # Sense entrada anterior vàlida no hi ha res a conservar
+        due += [s for s in waiting if previous_entries.get(s['code'], {}).get('rows') is None]
+        waiting = [s for s in waiting if s not in due]
+        fresh = build_snapshot(due, previous=snapshot)
+        record_polls(polling, due, fresh)
+        fresh['stations'].update({s['code']: previous_entries[s['code']] for s in waiting})
+        snapshot = fresh
+        print(f"📦 Instantània nova: {len(due)} estacions descarregades, "
+              f"{len(waiting)} sense període nou previst")
+        try:
+            polling.save()
+        except Exception as e:
+            print(f"⚠️  Error guardant l'estat de consulta: {e}")
+    else:
+        snapshot = build_snapshot(stations, previous=snapshot)
+        print(f"📦 Instantània nova ({len(stations)} estacions)")
+
+    try:
+        save_snapshot(snapshot, filename)
+    except Exception as e:
+        print(f"⚠️  Error guardant la instantània: {e}")
+    return snapshot
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# observation_store.py - ARXIU HISTÒRIC D'OBSERVACIONS (SQLite)
+# Totes les observacions semihoràries de totes les estacions, indexades per
+# (estació, data, període). Cada execució només escriu els períodes nous o
+# els que la XEMA ha revisat (valors diferents); la resta no es toca.
+# Les consultes per estació i rang de dates fan servir la clau primària.
+# A GitHub Actions la base de dades passa d'una execució a l'altra amb
+# actions/cache i un cop per dia (UTC) se'n desa còpia a la branca
+# data-archive, d'on es recupera si la memòria cau s'ha perdut (update.yml).
+#
+# Ús:
+#   python observation_store.py XJ 2026-01-01 2026-01-31 [--fields tx,tn,ppt]
+
+import argparse
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+import xema_schema
+
+DB_FILE = os.path.join('data', 'observations.sqlite')
+
+FIELDS = xema_schema.FIELDS
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS observations (
+    station    TEXT NOT NULL,
+    date       TEXT NOT NULL,
+    period     TEXT NOT NULL,
+    {', '.join(f'{field} REAL' for field in FIELDS)},
+    revision   INTEGER NOT NULL DEFAULT 0,
+    first_seen TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (station, date, period)
+) WITHOUT ROWID
+"""
+
+_UPSERT = f"""
+INSERT INTO observations (station, date, period, {', '.join(FIELDS)}, first_seen, updated_at)
+VALUES (?, ?, ?, {', '.join('?' for _ in FIELDS)}, ?, ?)
+ON CONFLICT (station, date, period) DO UPDATE SET
+    {', '.join(f'{field} = excluded.{field}' for field in FIELDS)},
+    revision = revision + 1,
+    updated_at = excluded.updated_at
+"""
+
+
+class ObservationStore:
+    """Arxiu d'observacions amb clau (estació, data, període)"""
+
+    def __init__(self, filename=DB_FILE):
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        self.filename = filename
+        self.conn = sqlite3.connect(filename)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _stored_values(self, station, date):
+        """Valors guardats d'un dia: {període: tupla de valors}"""
+        cursor = self.conn.execute(
+            f"SELECT period, {', '.join(FIELDS)} FROM observations WHERE station = ? AND date = ?",
+            (station, date))
+        return {row[0]: row[1:] for row in cursor}
+
+    def upsert_periods(self, station, periods):
+        """
+        Desa els períodes d'una estació (diccionaris del resum diari)
+
+        Només s'escriuen els períodes nous i els que han canviat respecte
+        del que hi ha guardat. Retorna (nous, revisats).
+        """
+        now = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        stored = {}
+        rows = []
+        new = revised = 0
+        for period in periods:
+            date = period['date']
+            if date not in stored:
+                stored[date] = self._stored_values(station, date)
+            values = tuple(period.get(field) for field in FIELDS)
+            previous = stored[date].get(period['period'])
+            if previous == values:
+                continue
+            if previous is None:
+                new += 1
+            else:
+                revised += 1
+            stored[date][period['period']] = values
+            rows.append((station, date, period['period'], *values, now, now))
+
+        if rows:
+            with self.conn:
+                self.conn.executemany(_UPSERT, rows)
+        return new, revised
+
+    def query(self, station, start_date, end_date=None, fields=None):
+        """Observacions d'una estació entre dues dates (incloses), en ordre"""
+        fields = tuple(fields or FIELDS)
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Camps desconeguts: {', '.join(sorted(unknown))}")
+        cursor = self.conn.execute(
+            f"SELECT date, period, {', '.join(fields)} FROM observations "
+            "WHERE station = ? AND date BETWEEN ? AND ? ORDER BY date, period",
+            (station, start_date, end_date or start_date))
+        return [dict(zip(('date', 'period') + fields, row)) for row in cursor]
+
+    def stations(self):
+        """Codis de les estacions que tenen observacions"""
+        return [row[0] for row in self.conn.execute(
+            "SELECT DISTINCT station FROM observations ORDER BY station")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consulta l'arxiu d'observacions")
+    parser.add_argument('station', help="codi de l'estació (p. ex. XJ)")
+    parser.add_argument('start', help="data inicial AAAA-MM-DD")
+    parser.add_argument('end', nargs='?', help="data final AAAA-MM-DD (per defecte, la inicial)")
+    parser.add_argument('--fields', default='', help="camps separats per comes (per defecte, tots)")
+    parser.add_argument('--db', default=DB_FILE, help="fitxer SQLite")
+    args = parser.parse_args(argv)
+
+    fields = [f.strip() for f in args.fields.split(',') if f.strip()] or None
+    with ObservationStore(args.db) as store:
+        rows = store.query(args.station, args.start, args.end, fields)
+    for row in rows:
+        print(' | '.join('' if value is None else str(value) for value in row.values()))
+    print(f"📊 {len(rows)} observacions")
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# period_index.py - ÍNDEX DE PERÍODES SEMIHORARIS
+# La XEMA publica un període cada 30 minuts amb el text 'HH:MM - HH:MM' en
+# hora TU. Cada text es parseja una sola vegada (expressió compilada i
+# memòria cau) a un índex enter 0-47 segons l'hora d'inici: 0 és
+# '00:00 - 00:30' i 47 és '23:30 - 00:00'. Amb l'índex, saber si un període
+# és nou, ordenar, treure duplicats o trobar forats són operacions amb enters.
+
+import re
+
+# Períodes semihoraris per dia
+SLOTS = 48
+SLOT_MINUTES = 30
+
+PERIOD_RE = re.compile(r'(\d{1,2}):(\d{2})\s*[-–]\s*(\d{1,2}):(\d{2})')
+
+# {text: índex o None} (també es recorden els textos que no són períodes)
+_cache = {}
+
+
+def parse(text):
+    """Índex 0-47 del període 'HH:MM - HH:MM' (segons l'hora d'inici), o None"""
+    try:
+        return _cache[text]
+    except KeyError:
+        pass
+    except TypeError:
+        return None
+    slot = None
+    match = PERIOD_RE.match(text or '')
+    if match:
+        minutes = int(match.group(1)) * 60 + int(match.group(2))
+        if minutes < SLOTS * SLOT_MINUTES:
+            slot = minutes // SLOT_MINUTES
+    _cache[text] = slot
+    return slot
+
+
+def label(slot):
+    """Text 'HH:MM - HH:MM' d'un índex 0-47"""
+    start = slot * SLOT_MINUTES
+    end = start + SLOT_MINUTES
+    return f"{start // 60:02d}:{start % 60:02d} - {end // 60 % 24:02d}:{end % 60:02d}"
+
+
+def end_minutes(slot):
+    """Minuts des de mitjanit (UTC) del final del període (1440 per a l'últim)"""
+    return (slot + 1) * SLOT_MINUTES
+
+
+def missing(slots):
+    """Índexs que falten entre el primer i l'últim dels `slots` (forats), en ordre"""
+    present = set(slots)
+    if not present:
+        return []
+    return [slot for slot in range(min(present), max(present)) if slot not in present]
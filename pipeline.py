@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# pipeline.py - ORQUESTRADOR EN UN SOL PROCÉS
+# Executa scrape → agregat diari → HTML → RSS → aviació dins el mateix
+# intèrpret, com un petit graf de dependències. Cada etapa es salta si
+# l'empremta (hash) de les seves entrades no ha canviat des de l'última
+# execució i les seves sortides encara existeixen (a GitHub Actions,
+# data/pipeline_state.json i les sortides es conserven amb actions/cache).
+#
+# Ús:
+#   python pipeline.py              # executa les etapes necessàries
+#   python pipeline.py --force      # executa-ho tot
+#   python pipeline.py --only rss   # només les etapes indicades (i cap dependència)
+#   python pipeline.py --daemon     # procés permanent amb planificador intern
+#   python pipeline.py --publish    # i prepara public/ amb els artefactes canviats
+
+import argparse
+import hashlib
+import json
+import os
+import signal
+import sys
+import time
+from datetime import datetime, timezone
+from graphlib import TopologicalSorter
+
+import adaptive_polling
+import artifacts
+import http_client
+import observation_snapshot
+import station_registry
+from scheduler import Job, Scheduler, at_minutes, every_minutes
+
+STATE_FILE = os.path.join('data', 'pipeline_state.json')
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts')
+
+
+class Stage:
+    """
+    Una etapa del pipeline
+
+    - run: funció sense arguments; retornar False (o llançar) és un error
+    - deps: etapes que s'han d'executar abans
+    - fingerprint: funció que retorna una cadena amb l'empremta de les
+      entrades, o None per executar l'etapa sempre
+    - outputs: fitxers que ha de deixar; si en falta algun, es torna a executar
+    - critical: si falla, el pipeline acaba amb codi d'error
+    """
+
+    def __init__(self, name, run, deps=(), fingerprint=None, outputs=(), critical=True):
+        self.name = name
+        self.run = run
+        self.deps = tuple(deps)
+        self.fingerprint = fingerprint
+        self.outputs = tuple(outputs)
+        self.critical = critical
+
+
+def hash_data(*parts):
+    """Hash estable de dades serialitzables en JSON"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_json(filename):
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_state(filename=STATE_FILE):
+    return load_json(filename) or {}
+
+
+def save_state(state, filename=STATE_FILE):
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    tmp = f"{filename}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, filename)
+
+
+# ---------------------------------------------------------------------------
+# Etapes
+# ---------------------------------------------------------------------------
+
+def all_stations():
+    """Unió de les estacions del RSS i del resum diari (sense repetir)"""
+    stations = {}
+    for station in station_registry.stations_for('daily') + station_registry.stations_for('rss'):
+        stations.setdefault(station['code'], station)
+    return list(stations.values())
+
+
+def stage_scrape():
+    """Descarrega i parseja les estacions que poden tenir un període nou (instantània nova)"""
+    # Els errors per estació queden a la instantània: el RSS farà servir
+    # les dades antigues d'aquestes estacions
+    observation_snapshot.get_snapshot(all_stations(), max_age=0,
+                                      polling=adaptive_polling.PollingState())
+    return True
+
+
+def snapshot_fingerprint(stations):
+    """Empremta del contingut de les pàgines d'unes estacions a la instantània"""
+    snapshot = load_json(observation_snapshot.SNAPSHOT_FILE) or {}
+    entries = snapshot.get('stations', {})
+    return hash_data([(s['code'], entries.get(s['code'], {}).get('sha256')) for s in stations])
+
+
+def fingerprint_daily():
+    # La data UTC forma part de l'empremta: a mitjanit UTC es genera el fitxer nou
+    return hash_data(datetime.now(timezone.utc).strftime('%Y%m%d'),
+                     snapshot_fingerprint(station_registry.stations_for('daily')))
+
+
+def stage_daily():
+    import daily_weather_scraper
+    daily_weather_scraper.reset_log()
+    result = daily_weather_scraper.main()
+    return bool(result and result['metadata']['total_stations'] > 0)
+
+
+def fingerprint_html():
+    # Només les dades de les estacions (generated_at no surt a l'HTML)
+    summary = load_json('data/weather_summary.json') or {}
+    return hash_data(summary.get('stations'))
+
+
+def stage_html():
+    import generate_fullscreen_html
+    return generate_fullscreen_html.main()
+
+
+def fingerprint_rss():
+    return snapshot_fingerprint(station_registry.stations_for('rss'))
+
+
+def stage_rss():
+    import generate_meteo_rss
+    generate_meteo_rss.reset_log()
+    return generate_meteo_rss.create_rss_feed()
+
+
+def stage_aviation():
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    import fetch_aviation
+    fetch_aviation.main()
+    return True
+
+
+STAGES = [
+    Stage('scrape', stage_scrape,
+          outputs=[observation_snapshot.SNAPSHOT_FILE]),
+    Stage('daily', stage_daily, deps=['scrape'],
+          fingerprint=fingerprint_daily,
+          outputs=['data/weather_summary.json']),
+    Stage('html', stage_html, deps=['daily'],
+          fingerprint=fingerprint_html,
+          outputs=[s['outputs']['html'] for s in station_registry.stations_for('html')]),
+    Stage('rss', stage_rss, deps=['scrape'],
+          fingerprint=fingerprint_rss,
+          outputs=['meteo.rss', 'weather_data.json']),
+    Stage('aviation', stage_aviation,
+          outputs=['data/aviation.json'], critical=False),
+]
+
+
+# ---------------------------------------------------------------------------
+# Execució
+# ---------------------------------------------------------------------------
+
+def run_pipeline(stages=None, force=False, only=None, state_file=STATE_FILE):
+    """
+    Executa les etapes en ordre topològic
+
+    Retorna un diccionari {etapa: 'ok' | 'skipped' | 'failed' | 'blocked'}.
+    """
+    stages = stages or STAGES
+    by_name = {stage.name: stage for stage in stages}
+    order = TopologicalSorter({s.name: s.deps for s in stages}).static_order()
+
+    state = load_state(state_file)
+    results = {}
+
+    for name in order:
+        stage = by_name[name]
+        if only and name not in only:
+            continue
+
+        if any(results.get(dep) in ('failed', 'blocked') for dep in stage.deps):
+            results[name] = 'blocked'
+            print(f"⛔ {name}: bloquejada (ha fallat una dependència)")
+            continue
+
+        fingerprint = stage.fingerprint() if stage.fingerprint else None
+        previous = state.get(name, {})
+        outputs_ok = all(os.path.exists(path) for path in stage.outputs)
+
+        if (not force and fingerprint is not None and outputs_ok
+                and previous.get('fingerprint') == fingerprint
+                and previous.get('status') == 'ok'):
+            results[name] = 'skipped'
+            print(f"⏭️  {name}: entrades sense canvis, es salta")
+            continue
+
+        print(f"\n▶️  {name}")
+        artifacts.WRITER.reset()
+        start = time.monotonic()
+        try:
+            ok = stage.run() is not False
+        except Exception as e:
+            print(f"❌ {name}: {e}")
+            ok = False
+        elapsed = time.monotonic() - start
+
+        results[name] = 'ok' if ok else 'failed'
+        changed = artifacts.WRITER.changed()
+        state[name] = {
+            'status': results[name],
+            'fingerprint': fingerprint,
+            'finished_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'duration_s': round(elapsed, 3),
+            'changed': changed,
+        }
+        print(f"{'✅' if ok else '❌'} {name}: {results[name]} ({elapsed:.2f}s)")
+        if artifacts.WRITER.manifest:
+            print(f"   📝 Sortides: {len(changed)} canviades, "
+                  f"{len(artifacts.WRITER.unchanged())} sense canvis")
+
+    save_state(state, state_file)
+    return results
+
+
+# Feines del mode dimoni (en aquest ordre quan coincideixen: el RSS
+# reaprofita la instantània que acaba de fer la feina diària)
+DAEMON_JOBS = [
+    # Resum diari i HTML a les :15 i :45
+    ('daily', {'scrape', 'daily', 'html'}, at_minutes(15, 45)),
+    # RSS: comprovació cada minut; adaptive_polling decideix quines
+    # estacions es descarreguen i el RSS només es regenera si hi ha dades noves
+    ('rss', {'scrape', 'rss'}, every_minutes(1)),
+    # METAR/TAF dos cops per hora
+    ('aviation', {'aviation'}, at_minutes(5, 35)),
+]
+
+
+def run_daemon():
+    """
+    Mode dimoni: el procés es queda en marxa i executa les etapes segons
+    DAEMON_JOBS. Les connexions HTTP (keep-alive), el registre d'estacions,
+    els esquemes compilats i la instantània es mantenen en memòria.
+    """
+    print("=" * 60)
+    print("🛰️  PIPELINE METEO - MODE DIMONI")
+    print("=" * 60)
+
+    scheduler = Scheduler()
+    for name, only, schedule in DAEMON_JOBS:
+        scheduler.add(Job(name, lambda only=only: run_pipeline(only=only), schedule))
+
+    def handle_signal(signum, frame):
+        print(f"\n🛑 Senyal {signum} rebut, aturant...")
+        scheduler.stop()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    # Primera execució completa perquè tots els artefactes existeixin
+    run_pipeline()
+    try:
+        scheduler.run_forever()
+    finally:
+        http_client.close_session()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pipeline meteo en un sol procés")
+    parser.add_argument('--force', action='store_true',
+                        help="executa totes les etapes encara que no hi hagi canvis")
+    parser.add_argument('--only', default='',
+                        help="llista d'etapes separades per comes")
+    parser.add_argument('--daemon', action='store_true',
+                        help="procés permanent amb planificador intern (consulta adaptativa cada minut, diari a :15/:45)")
+    parser.add_argument('--publish', action='store_true',
+                        help="prepara el directori de publicació amb els artefactes que han canviat")
+    args = parser.parse_args(argv)
+
+    os.makedirs('data', exist_ok=True)
+    if args.daemon:
+        return run_daemon()
+
+    only = {name.strip() for name in args.only.split(',') if name.strip()} or None
+
+    print("=" * 60)
+    print("🚀 PIPELINE METEO")
+    print("=" * 60)
+    results = run_pipeline(force=args.force, only=only)
+
+    print("\n" + "=" * 60)
+    for name, status in results.items():
+        print(f"   • {name}: {status}")
+    print("=" * 60)
+
+    if args.publish:
+        import publish
+        publish.print_summary(*publish.stage())
+
+    critical = {stage.name for stage in STAGES if stage.critical}
+    failed = [name for name, status in results.items()
+              if status in ('failed', 'blocked') and name in critical]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
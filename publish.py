@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# publish.py - PUBLICACIÓ INCREMENTAL (gh-pages)
+# En lloc de pujar tot el directori a cada execució (codi, CSV, arxiu
+# SQLite...), es publica només un conjunt explícit d'artefactes:
+#   - les pàgines estàtiques (index, tickers OBS)
+#   - les sortides generades (RSS, HTML de les estacions, JSON)
+# De cadascun es calcula el hash (SHA-256) i la mida, i es compara amb el
+# manifest de la publicació anterior (publish_manifest.json, que també es
+# publica). Al directori de publicació només es copien els fitxers que han
+# canviat i el manifest nou; la resta ja són a gh-pages (keep_files).
+#
+# Ús:
+#   python publish.py                       # prepara public/
+#   python publish.py --previous FITXER     # manifest publicat anterior
+#   python publish.py --all                 # copia tots els artefactes
+
+import argparse
+import glob
+import json
+import os
+import shutil
+import sys
+from datetime import datetime, timezone
+
+import artifacts
+import station_registry
+
+PUBLISH_DIR = 'public'
+MANIFEST_NAME = 'publish_manifest.json'
+
+# Còpia local de l'últim manifest preparat (el workflow hi deixa el de gh-pages)
+PREVIOUS_MANIFEST = os.path.join('data', MANIFEST_NAME)
+
+# Fitxers del repositori que es publiquen tal qual
+STATIC_FILES = ['index.html', 'meteo-ticker-obs.html', 'meteo-ticker-obs-B.html']
+
+# Sortides generades (es permeten patrons glob)
+GENERATED_FILES = [
+    'meteo.rss',
+    'weather_data.json',
+    'data/weather_summary.json',
+    'data/weather_daily_*.json',
+    'data/aviation.json',
+]
+
+
+def artifact_paths():
+    """Camins (relatius) dels artefactes publicables que existeixen, sense repetir"""
+    patterns = STATIC_FILES + GENERATED_FILES
+    patterns += [s['outputs']['html'] for s in station_registry.stations_for('html')]
+    paths = {}
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]:
+            if os.path.isfile(path):
+                paths.setdefault(path.replace(os.sep, '/'), None)
+    return list(paths)
+
+
+def build_manifest(paths=None):
+    """Manifest adreçat per contingut: {camí: {'sha256', 'bytes'}}"""
+    files = {}
+    for path in artifact_paths() if paths is None else paths:
+        digest = artifacts.WRITER.file_hash(path)
+        if digest is not None:
+            files[path] = {'sha256': digest, 'bytes': os.path.getsize(path)}
+    return files
+
+
+def load_manifest(filename):
+    """Manifest anterior complet ({} si no n'hi ha)"""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def changed_files(current, previous):
+    """Camins amb contingut nou o diferent del manifest anterior"""
+    return [path for path, entry in current.items()
+            if previous.get(path, {}).get('sha256') != entry['sha256']]
+
+
+def stage(publish_dir=PUBLISH_DIR, previous_file=PREVIOUS_MANIFEST, copy_all=False):
+    """
+    Prepara el directori de publicació amb els artefactes canviats i el manifest
+
+    Retorna (manifest, camins copiats).
+    """
+    current = build_manifest()
+    previous_manifest = load_manifest(previous_file)
+    previous = {} if copy_all else previous_manifest.get('files', {})
+    changed = list(current) if copy_all else changed_files(current, previous)
+
+    if os.path.isdir(publish_dir):
+        shutil.rmtree(publish_dir)
+    os.makedirs(publish_dir)
+    for path in changed:
+        target = os.path.join(publish_dir, path)
+        os.makedirs(os.path.dirname(target) or publish_dir, exist_ok=True)
+        shutil.copy2(path, target)
+
+    # Si els artefactes no han canviat, el manifest tampoc (mateixa data):
+    # així no es fa cap commit nou a gh-pages
+    generated_at = previous_manifest.get('generated_at')
+    if previous_manifest.get('files') != current or not generated_at:
+        generated_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    manifest = {
+        'generated_at': generated_at,
+        'files': current,
+    }
+    artifacts.write_json(os.path.join(publish_dir, MANIFEST_NAME), manifest,
+                         ensure_ascii=False, indent=2, sort_keys=True)
+    artifacts.write_json(PREVIOUS_MANIFEST, manifest, ensure_ascii=False, indent=2, sort_keys=True)
+    return manifest, changed
+
+
+def print_summary(manifest, changed):
+    files = manifest['files']
+    total = sum(entry['bytes'] for entry in files.values())
+    staged = sum(files[path]['bytes'] for path in changed)
+    print(f"📦 Publicació: {len(changed)}/{len(files)} artefactes canviats "
+          f"({staged / 1024:.1f} KB de {total / 1024:.1f} KB)")
+    for path in changed:
+        print(f"   • {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prepara la publicació incremental a gh-pages")
+    parser.add_argument('--dir', default=PUBLISH_DIR, help="directori de publicació")
+    parser.add_argument('--previous', default=PREVIOUS_MANIFEST,
+                        help="manifest de la publicació anterior")
+    parser.add_argument('--all', action='store_true', help="copia tots els artefactes")
+    args = parser.parse_args(argv)
+
+    manifest, changed = stage(args.dir, args.previous, copy_all=args.all)
+    print_summary(manifest, changed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
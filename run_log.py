@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# run_log.py - LOG D'EXECUCIÓ AMB MEMÒRIA INTERMÈDIA
+# En lloc d'obrir i tancar el fitxer de log a cada missatge, cada execució
+# obre un sol fitxer amb memòria intermèdia que es buida en acabar (o quan
+# hi ha un error). A més:
+#   - nivells (DEBUG, INFO, WARNING, ERROR): per defecte no s'escriuen els
+#     missatges de depuració (columnes, files...); METEO_LOG_LEVEL=DEBUG
+#     els activa
+#   - rotació per mida: en començar l'execució, si el fitxer passa de
+#     MAX_BYTES es renombra a .1, .2... (se'n guarden BACKUPS)
+#   - memòria circular opcional: els últims missatges que no s'han escrit
+#     (per nivell) es guarden en memòria i només s'aboquen al fitxer si hi
+#     ha un error
+
+import atexit
+import os
+from collections import deque
+from datetime import datetime
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVELS = {'DEBUG': DEBUG, 'INFO': INFO, 'WARNING': WARNING, 'ERROR': ERROR}
+
+# Nivell per defecte (variable d'entorn METEO_LOG_LEVEL)
+LEVEL_ENV = 'METEO_LOG_LEVEL'
+
+MAX_BYTES = 1024 * 1024
+BACKUPS = 3
+BUFFER_SIZE = 64 * 1024
+
+# Missatges que guarda la memòria circular
+RING_SIZE = 200
+
+
+def level_from_env(default=INFO):
+    """Nivell de METEO_LOG_LEVEL (nom o número), o `default`"""
+    value = os.environ.get(LEVEL_ENV, '').strip().upper()
+    if value.isdigit():
+        return int(value)
+    return LEVELS.get(value, default)
+
+
+class RunLog:
+    """Log d'una execució: un fitxer obert amb memòria intermèdia"""
+
+    def __init__(self, filename, timestamps=False, level=None, echo=True,
+                 max_bytes=MAX_BYTES, backups=BACKUPS, ring_size=RING_SIZE):
+        self.filename = filename
+        self.timestamps = timestamps
+        self.level = level_from_env() if level is None else level
+        self.echo = echo
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.ring = deque(maxlen=ring_size) if ring_size else None
+        self._file = None
+        self._atexit = False
+
+    def _format(self, message):
+        if self.timestamps:
+            return f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - {message}\n"
+        return message + '\n'
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.filename, 'a', encoding='utf-8', buffering=BUFFER_SIZE)
+            if not self._atexit:
+                atexit.register(self.close)
+                self._atexit = True
+        return self._file
+
+    def rotate(self):
+        """Renombra el fitxer (.1, .2...) si passa de max_bytes"""
+        try:
+            if os.path.getsize(self.filename) <= self.max_bytes:
+                return False
+        except OSError:
+            return False
+        if self.backups <= 0:
+            os.remove(self.filename)
+            return True
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.filename}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.filename}.{index + 1}")
+        os.replace(self.filename, f"{self.filename}.1")
+        return True
+
+    def start(self, header):
+        """Comença una execució: tanca l'anterior, rota si cal i escriu la capçalera"""
+        self.close()
+        self.rotate()
+        if self.ring is not None:
+            self.ring.clear()
+        self._open().write(header + '\n')
+
+    def log(self, message, level=INFO):
+        """Escriu un missatge (i el mostra per pantalla) si arriba al nivell"""
+        if level < self.level:
+            if self.ring is not None:
+                self.ring.append(self._format(message))
+            return
+        if self.echo:
+            print(message)
+        if level >= ERROR:
+            # Context de l'error: primer els missatges de depuració retinguts
+            self.dump_ring()
+        self._open().write(self._format(message))
+        if level >= ERROR:
+            self.flush()
+
+    def debug(self, message):
+        self.log(message, DEBUG)
+
+    def info(self, message):
+        self.log(message, INFO)
+
+    def warning(self, message):
+        self.log(message, WARNING)
+
+    def error(self, message):
+        self.log(message, ERROR)
+
+    def dump_ring(self):
+        """Aboca al fitxer els missatges no escrits de la memòria circular"""
+        if not self.ring:
+            return 0
+        count = len(self.ring)
+        f = self._open()
+        f.write(f"--- {count} missatges de depuració anteriors ---\n")
+        f.writelines(self.ring)
+        f.write("--- fi dels missatges de depuració ---\n")
+        self.ring.clear()
+        return count
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
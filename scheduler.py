@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# scheduler.py - PLANIFICADOR INTERN (MODE DIMONI)
+# Substitueix els disparadors externs (cron-job.org → GitHub Actions):
+# el procés es queda en marxa i executa cada feina quan li toca.
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+
+def every_minutes(interval, offset=0):
+    """Planificació cada `interval` minuts, alineada al rellotge (+ `offset` minuts)"""
+    def next_time(now):
+        base = now.replace(second=0, microsecond=0)
+        minutes = base.hour * 60 + base.minute
+        step = (minutes - offset) // interval + 1
+        day = base.replace(hour=0, minute=0)
+        return day + timedelta(minutes=step * interval + offset)
+    return next_time
+
+
+def at_minutes(*minutes):
+    """Planificació a uns minuts concrets de cada hora (p. ex. 15 i 45)"""
+    minutes = sorted(set(minutes))
+
+    def next_time(now):
+        base = now.replace(second=0, microsecond=0)
+        for minute in minutes:
+            candidate = base.replace(minute=minute)
+            if candidate > now:
+                return candidate
+        return base.replace(minute=minutes[0]) + timedelta(hours=1)
+    return next_time
+
+
+class Job:
+    """Una feina planificada: `run()` s'executa a cada hora que retorna `schedule(now)`"""
+
+    def __init__(self, name, run, schedule):
+        self.name = name
+        self.run = run
+        self.schedule = schedule
+        self.next_run = None
+        self.last_duration = None
+
+    def plan(self, now):
+        self.next_run = self.schedule(now)
+
+
+class Scheduler:
+    """Executa les feines en ordre, d'una en una, dins el mateix procés"""
+
+    def __init__(self, jobs=(), clock=None):
+        self.jobs = list(jobs)
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self.stop_event = threading.Event()
+
+    def add(self, job):
+        self.jobs.append(job)
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run_job(self, job):
+        start = time.monotonic()
+        try:
+            job.run()
+        except Exception as e:
+            print(f"❌ Feina {job.name}: {e}")
+        job.last_duration = time.monotonic() - start
+
+    def run_pending(self):
+        """Executa les feines que ja toquen i les torna a planificar"""
+        now = self.clock()
+        for job in self.jobs:
+            if job.next_run is None:
+                job.plan(now)
+            elif job.next_run <= now:
+                print(f"\n⏰ {now.strftime('%H:%M:%S')} UTC - {job.name}")
+                self.run_job(job)
+                job.plan(self.clock())
+
+    def seconds_until_next(self):
+        now = self.clock()
+        pending = [job.next_run for job in self.jobs if job.next_run is not None]
+        if not pending:
+            return 0.0
+        return max(0.0, (min(pending) - now).total_seconds())
+
+    def run_forever(self):
+        """Bucle principal fins que es crida stop()"""
+        self.run_pending()
+        while not self.stop_event.is_set():
+            upcoming = min((job for job in self.jobs if job.next_run), key=lambda job: job.next_run, default=None)
+            if upcoming:
+                print(f"💤 Propera feina: {upcoming.name} a les {upcoming.next_run.strftime('%H:%M')} UTC")
+            self.stop_event.wait(self.seconds_until_next())
+            if not self.stop_event.is_set():
+                self.run_pending()
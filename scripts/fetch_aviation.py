@@ -2,8 +2,13 @@ import os
 os.makedirs("data", exist_ok=True)
 import json
 import re
+import sys
 from datetime import datetime, timezone
-from urllib.request import urlopen
+
+# Client HTTP compartit, magnituds derivades i escriptura de sortides (a l'arrel del repositori)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import artifacts
+import http_cache
 
 AIRPORTS = [
     {"icao": "LEGE", "name": "Girona – Costa Brava"},
@@ -15,8 +20,8 @@ TAF_URL   = "https://tgftp.nws.noaa.gov/data/forecasts/taf/stations/{icao}.TXT"
 
 
 def fetch_text(url: str) -> str:
-    with urlopen(url) as r:
-        return r.read().decode("utf-8", errors="replace").strip()
+    r = http_cache.fetch(url)
+    return r.content.decode("utf-8", errors="replace").strip()
 
 
 def split_raw(txt: str):
@@ -100,34 +105,76 @@ def parse_fields(metar: str) -> dict:
     return f
 
 
-output = {
-    "generated_at_utc": datetime.now(timezone.utc).isoformat(timespec="seconds"),
-    "airports": []
-}
-
-for a in AIRPORTS:
-    metar_txt = fetch_text(METAR_URL.format(icao=a["icao"]))
-    taf_txt   = fetch_text(TAF_URL.format(icao=a["icao"]))
+def latest_issued(airports, previous=None) -> str:
+    """
+    Hora d'emissió més recent dels METAR/TAF (ISO, UTC).
+    És l'hora de les dades, no la del rellotge: amb els mateixos informes
+    aviation.json surt idèntic i no es reescriu. Si cap informe té hora,
+    es manté `previous` (la ja desada).
+    """
+    issued = []
+    for a in airports:
+        for report in (a["metar"], a["taf"]):
+            try:
+                dt = datetime.strptime(report["issued"] or "", "%Y/%m/%d %H:%M")
+            except ValueError:
+                continue
+            issued.append(dt.replace(tzinfo=timezone.utc))
+    if not issued and previous:
+        return previous
+    latest = max(issued) if issued else datetime.now(timezone.utc)
+    return latest.isoformat(timespec="seconds")
+
+
+def previous_generated_at():
+    """generated_at_utc del data/aviation.json anterior, o None"""
+    try:
+        with open("data/aviation.json", "r", encoding="utf-8") as f:
+            return json.load(f).get("generated_at_utc")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def main():
+    """Descarrega METAR i TAF dels aeroports i escriu data/aviation.json"""
+    output = {
+        "generated_at_utc": None,
+        "airports": []
+    }
+
+    for a in AIRPORTS:
+        metar_txt = fetch_text(METAR_URL.format(icao=a["icao"]))
+        taf_txt   = fetch_text(TAF_URL.format(icao=a["icao"]))
+
+        metar_issued, metar_raw = split_raw(metar_txt)
+        taf_issued, taf_raw     = split_raw(taf_txt)
+
+        fields = parse_fields(metar_raw)
+
+        output["airports"].append({
+            "icao": a["icao"],
+            "name": a["name"],
+            "metar": {
+                "issued": metar_issued,
+                "raw": metar_raw,
+                "fields": fields
+            },
+            "taf": {
+                "issued": taf_issued,
+                "raw": taf_raw
+            }
+        })
 
-    metar_issued, metar_raw = split_raw(metar_txt)
-    taf_issued, taf_raw     = split_raw(taf_txt)
+    # Humitat i sensació tèrmica de tots els aeroports d'un sol cop
+    # (NumPy només es carrega aquí)
+    import derived_metrics
+    derived_metrics.add_metar_derived([a["metar"]["fields"] for a in output["airports"]])
 
-    fields = parse_fields(metar_raw)
+    output["generated_at_utc"] = latest_issued(output["airports"], previous_generated_at())
+    artifacts.write_json("data/aviation.json", output, indent=2, ensure_ascii=False)
 
-    output["airports"].append({
-        "icao": a["icao"],
-        "name": a["name"],
-        "metar": {
-            "issued": metar_issued,
-            "raw": metar_raw,
-            "fields": fields
-        },
-        "taf": {
-            "issued": taf_issued,
-            "raw": taf_raw
-        }
-    })
+    return output
 
-with open("data/aviation.json", "w", encoding="utf-8") as f:
-    json.dump(output, f, indent=2, ensure_ascii=False)
 
+if __name__ == "__main__":
+    main()
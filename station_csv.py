@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# station_csv.py - CSV PER ESTACIÓ I DIA, NOMÉS AFEGINT
+# El CSV data/XX_AAAAMMDD.csv creix tot el dia. En lloc de reescriure'l
+# sencer a cada execució:
+#   - un fitxer auxiliar (XX_AAAAMMDD.csv.tail.json) guarda la mida del CSV
+#     i, per cada fila escrita, el període (índex 0-47), la posició i un
+#     CRC32 del text (menys d'1 KB per a un dia sencer)
+#   - els períodes nous s'afegeixen al final
+#   - si la XEMA revisa una fila ja escrita (normalment l'última) o arriba un
+#     període endarrerit, el fitxer es talla en aquella fila i només es
+#     reescriu la cua
+#   - sense fitxer auxiliar, o si la mida no quadra, es reescriu sencer
+# Les columnes són sempre les mateixes (totes les de xema_schema), en el
+# mateix ordre, independentment de la primera fila.
+# A GitHub Actions els CSV i els seus .tail.json es conserven amb
+# actions/cache i es copien cada dia a la branca data-archive (update.yml).
+#
+# Ús:
+#   python station_csv.py compact [FITXERS...]   # ordena, treu duplicats i refà l'auxiliar
+
+import argparse
+import csv
+import glob
+import io
+import json
+import os
+import sys
+import zlib
+
+import period_index
+import xema_schema
+
+COLUMNS = ('station_name', 'date', 'period', 'period_utc') + xema_schema.FIELDS
+
+SIDECAR_SUFFIX = '.tail.json'
+
+DEFAULT_PATTERN = os.path.join('data', '??_????????.csv')
+
+
+def sidecar_path(filename):
+    return filename + SIDECAR_SUFFIX
+
+
+def load_sidecar(filename):
+    try:
+        with open(sidecar_path(filename), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_sidecar(filename, size, index):
+    path = sidecar_path(filename)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'columns': list(COLUMNS), 'size': size, 'rows': index},
+                  f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp, path)
+
+
+class _RowFormatter:
+    """Text CSV (amb el final de línia) de cada fila, amb les COLUMNS"""
+
+    def __init__(self):
+        self.buffer = io.StringIO()
+        self.writer = csv.DictWriter(self.buffer, fieldnames=COLUMNS, extrasaction='ignore')
+
+    def header(self):
+        return self._text(self.writer.writeheader)
+
+    def row(self, record):
+        return self._text(lambda: self.writer.writerow(record))
+
+    def _text(self, write):
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        write()
+        return self.buffer.getvalue().encode('utf-8')
+
+
+def _slot_rows(periods):
+    """[(índex, registre)] ordenats per índex i sense duplicats (l'últim guanya)"""
+    slots = getattr(periods, 'slots', None)
+    if slots is not None:
+        return list(zip(slots, periods))
+    rows = {}
+    for record in periods:
+        slot = period_index.parse(record.get('period'))
+        if slot is not None:
+            rows[slot] = record
+    return sorted(rows.items())
+
+
+def _write_rows(f, rows, offset):
+    """Escriu les files (índex, bytes) a partir de `offset`; retorna (índex de files, offset final)"""
+    index = []
+    for slot, data in rows:
+        index.append([slot, offset, zlib.crc32(data)])
+        offset += len(data)
+    f.write(b''.join(data for _, data in rows))
+    return index, offset
+
+
+def _rewrite(filename, rows, header):
+    """Reescriu el fitxer sencer (capçalera + totes les files)"""
+    tmp = f"{filename}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(header)
+        index, size = _write_rows(f, rows, len(header))
+    os.replace(tmp, filename)
+    return index, size
+
+
+def _restart_slot(rows, index):
+    """
+    Primer període a reescriure, o None si només cal afegir
+
+    És el primer període ja escrit que ha canviat o ha desaparegut, o el
+    primer període anterior a l'últim escrit que encara no és al fitxer.
+    """
+    current = dict(rows)
+    restart = None
+    for slot, _offset, crc in index:
+        data = current.get(slot)
+        if data is None or zlib.crc32(data) != crc:
+            restart = slot
+            break
+    last_slot = index[-1][0] if index else -1
+    written = {entry[0] for entry in index}
+    for slot, _ in rows:
+        if slot >= last_slot or (restart is not None and slot >= restart):
+            break
+        if slot not in written:
+            restart = slot
+            break
+    return restart
+
+
+def write(periods, filename):
+    """
+    Desa els períodes d'una estació al seu CSV escrivint només el que cal
+
+    Retorna (mode, files escrites), on mode és 'append', 'tail', 'rewrite' o
+    'unchanged'.
+    """
+    formatter = _RowFormatter()
+    rows = [(slot, formatter.row(record)) for slot, record in _slot_rows(periods)]
+
+    state = load_sidecar(filename)
+    try:
+        size = os.path.getsize(filename)
+    except OSError:
+        size = None
+    if (state is None or size != state.get('size') or state.get('columns') != list(COLUMNS)
+            or not isinstance(state.get('rows'), list)):
+        index, size = _rewrite(filename, rows, formatter.header())
+        save_sidecar(filename, size, index)
+        return 'rewrite', len(rows)
+
+    index = state['rows']
+    restart = _restart_slot(rows, index)
+    if restart is None:
+        last_slot = index[-1][0] if index else -1
+        new_rows = [(slot, data) for slot, data in rows if slot > last_slot]
+        if not new_rows:
+            return 'unchanged', 0
+        with open(filename, 'ab') as f:
+            new_index, size = _write_rows(f, new_rows, size)
+        mode = 'append'
+    else:
+        # Es talla a la primera fila escrita a partir del període a reescriure
+        cut = next(i for i, entry in enumerate(index) if entry[0] >= restart)
+        new_rows = [(slot, data) for slot, data in rows if slot >= restart]
+        with open(filename, 'r+b') as f:
+            f.seek(index[cut][1])
+            f.truncate()
+            new_index, size = _write_rows(f, new_rows, index[cut][1])
+        index = index[:cut]
+        mode = 'tail'
+
+    save_sidecar(filename, size, index + new_index)
+    return mode, len(new_rows)
+
+
+def compact(filename):
+    """Reescriu un CSV ordenat per període, sense duplicats i amb les COLUMNS; refà l'auxiliar"""
+    with open(filename, 'r', encoding='utf-8', newline='') as f:
+        records = list(csv.DictReader(f))
+    formatter = _RowFormatter()
+    rows = [(slot, formatter.row(record)) for slot, record in _slot_rows(records)]
+    index, size = _rewrite(filename, rows, formatter.header())
+    save_sidecar(filename, size, index)
+    return len(records), len(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CSV per estació i dia")
+    parser.add_argument('command', choices=['compact'])
+    parser.add_argument('files', nargs='*', help=f"fitxers CSV (per defecte {DEFAULT_PATTERN})")
+    args = parser.parse_args(argv)
+
+    files = args.files or sorted(glob.glob(DEFAULT_PATTERN))
+    for filename in files:
+        try:
+            before, after = compact(filename)
+        except (OSError, csv.Error) as e:
+            print(f"❌ {filename}: {e}")
+            continue
+        print(f"🗜️  {filename}: {before} files → {after}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
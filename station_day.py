@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# station_day.py - DADES D'UNA ESTACIÓ I UN DIA EN COLUMNES
+# En lloc d'un diccionari per període (que repeteix nom, data i període),
+# cada camp és una columna array('d') i els valors que falten són NaN.
+# El nom de l'estació i la data es guarden una sola vegada; cada període
+# porta el seu índex 0-47 (period_index) per ordenar i treure duplicats.
+# La classe es comporta com una seqüència de diccionaris de període amb la
+# forma de sempre (JSON/CSV del resum diari), generats només quan es demanen.
+
+import bisect
+import hashlib
+import math
+from array import array
+
+import period_index
+import xema_schema
+
+# Camps que té sempre cada període (la resta només si l'estació té la columna)
+BASE_FIELDS = xema_schema.FIELDS[:5]
+
+MISSING = math.nan
+
+
+class StationDay:
+    """Períodes d'una estació per a un dia, en columnes"""
+
+    def __init__(self, station_name, date, extra_fields=()):
+        self.station_name = station_name
+        self.date = date
+        self.fields = BASE_FIELDS + tuple(f for f in xema_schema.FIELDS[5:] if f in extra_fields)
+        self.periods = []
+        self.slots = array('b')
+        self.columns = {field: array('d') for field in self.fields}
+
+    def append(self, period, values, slot=None):
+        """
+        Afegeix un període; `values` és {camp: número o None}
+
+        Els períodes es mantenen ordenats per índex: si l'índex ja hi és, la
+        fila nova substitueix l'anterior (duplicat); si és anterior a l'últim,
+        s'insereix al seu lloc.
+        """
+        if slot is None:
+            slot = period_index.parse(period)
+            if slot is None:
+                raise ValueError(f"Període no vàlid: {period!r}")
+        row = [MISSING if values.get(field) is None else values[field] for field in self.fields]
+
+        if not self.slots or slot > self.slots[-1]:
+            self.periods.append(period)
+            self.slots.append(slot)
+            for column, value in zip(self.columns.values(), row):
+                column.append(value)
+            return
+
+        index = bisect.bisect_left(self.slots, slot)
+        if self.slots[index] == slot:
+            self.periods[index] = period
+            for column, value in zip(self.columns.values(), row):
+                column[index] = value
+        else:
+            self.periods.insert(index, period)
+            self.slots.insert(index, slot)
+            for column, value in zip(self.columns.values(), row):
+                column.insert(index, value)
+
+    @property
+    def last_slot(self):
+        """Índex de l'últim període (None si no n'hi ha cap)"""
+        return self.slots[-1] if self.slots else None
+
+    def index_after(self, slot):
+        """Posició del primer període posterior a l'índex `slot`"""
+        return bisect.bisect_right(self.slots, slot)
+
+    def digest(self, fields, count=None):
+        """SHA-1 dels índexs i de les columnes `fields` dels primers `count` períodes (tots per defecte)"""
+        count = len(self.periods) if count is None else count
+        h = hashlib.sha1(memoryview(self.slots)[:count])
+        for field in fields:
+            h.update(memoryview(self.columns[field])[:count])
+        return h.hexdigest()
+
+    def missing_slots(self):
+        """Índexs dels períodes que falten entre el primer i l'últim"""
+        return period_index.missing(self.slots)
+
+    def value(self, field, index):
+        """Valor d'un camp en un període (None si falta)"""
+        value = self.columns[field][index]
+        return None if value != value else value
+
+    def iter_values(self, fields, start=0):
+        """Genera (període, tupla de valors dels `fields`) sense construir diccionaris"""
+        columns = [self.columns[field] for field in fields]
+        for index in range(start, len(self.periods)):
+            yield self.periods[index], tuple(None if column[index] != column[index] else column[index]
+                                             for column in columns)
+
+    def __len__(self):
+        return len(self.periods)
+
+    def __getitem__(self, index):
+        """Període en la forma del JSON/CSV del resum diari"""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        period = self.periods[index]
+        record = {
+            'station_name': self.station_name,
+            'date': self.date,
+            'period': period,
+            'period_utc': period,
+        }
+        for field in self.fields:
+            record[field] = self.value(field, index)
+        return record
+
+    def __iter__(self):
+        for index in range(len(self.periods)):
+            yield self[index]
+
+    def to_periods(self):
+        """Llista de diccionaris (per serialitzar)"""
+        return list(self)
+
+    def nbytes(self):
+        """Memòria aproximada de les columnes numèriques"""
+        return sum(column.itemsize * len(column) for column in self.columns.values())
+
+    @classmethod
+    def from_periods(cls, periods):
+        """Construeix les columnes a partir de diccionaris de període"""
+        if not periods:
+            return None
+        first = periods[0]
+        day = cls(first['station_name'], first['date'], extra_fields=first.keys())
+        for period in periods:
+            day.append(period['period'], period)
+        return day
+
+
+def json_default(obj):
+    """Per a json.dump(default=...): serialitza un StationDay com a llista de períodes"""
+    if isinstance(obj, StationDay):
+        return obj.to_periods()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# station_fetcher.py - DESCÀRREGA CONCURRENT DE LES ESTACIONS
+# Totes les estacions es consulten en paral·lel (amb límit de concurrència
+# i cortesia per host) i els resultats es retornen en l'ordre de la llista.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+# Nombre màxim de descàrregues simultànies (totes les estacions)
+DEFAULT_MAX_WORKERS = 4
+
+# Cortesia per host: peticions simultànies i separació mínima entre peticions
+DEFAULT_PER_HOST = 2
+DEFAULT_MIN_INTERVAL = 0.2  # segons
+
+
+class HostLimiter:
+    """Limita les peticions simultànies i la freqüència per a cada host"""
+
+    def __init__(self, per_host=DEFAULT_PER_HOST, min_interval=DEFAULT_MIN_INTERVAL):
+        self.per_host = max(1, per_host)
+        self.min_interval = max(0.0, min_interval)
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_start = {}
+
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self._semaphores[host]
+
+    def _wait_turn(self, host):
+        """Reserva el proper torn d'inici per al host i espera fins que arribi"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_interval
+        delay = start - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def run(self, url, func, *args):
+        host = urlparse(url).netloc
+        with self._semaphore(host):
+            self._wait_turn(host)
+            return func(*args)
+
+
+def fetch_stations(stations, fetch_fn, max_workers=DEFAULT_MAX_WORKERS,
+                   per_host=DEFAULT_PER_HOST, min_interval=DEFAULT_MIN_INTERVAL,
+                   default=None):
+    """
+    Executa fetch_fn(station) per a cada estació en paral·lel
+
+    Retorna una llista amb els resultats en el mateix ordre que `stations`.
+    Si fetch_fn llança una excepció, el resultat d'aquella estació és `default`.
+    """
+    if not stations:
+        return []
+
+    limiter = HostLimiter(per_host=per_host, min_interval=min_interval)
+
+    def task(station):
+        try:
+            return limiter.run(station.get('url', ''), fetch_fn, station)
+        except Exception as e:
+            print(f"❌ Error descarregant {station.get('name', station.get('code'))}: {e}")
+            return default
+
+    workers = max(1, min(max_workers, len(stations)))
+    if workers == 1:
+        return [task(station) for station in stations]
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='estacio') as executor:
+        # map() conserva l'ordre de les estacions
+        return list(executor.map(task, stations))
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# station_registry.py - REGISTRE CENTRAL D'ESTACIONS
+# Totes les estacions es defineixen a stations.json (codi, nom, URL,
+# coordenades, sortides activades i cadència de consulta). El fitxer es
+# carrega una sola vegada i s'indexa per codi i per sortida, de manera que
+# les consultes són O(1) encara que hi hagi centenars d'estacions.
+
+import copy
+import json
+import os
+import threading
+
+REGISTRY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stations.json')
+
+DEFAULT_URL_TEMPLATE = 'https://www.meteo.cat/observacions/xema/dades?codi={code}'
+
+# Sortides que pot tenir una estació
+OUTPUTS = ('rss', 'daily', 'html')
+
+
+class StationRegistry:
+    """Estacions indexades per codi i per sortida"""
+
+    def __init__(self, stations):
+        self._stations = []
+        self._by_code = {}
+        self._by_output = {output: [] for output in OUTPUTS}
+
+        for station in stations:
+            code = station['code']
+            if code in self._by_code:
+                raise ValueError(f"Estació duplicada al registre: {code}")
+            self._stations.append(station)
+            self._by_code[code] = station
+            if not station.get('enabled', True):
+                continue
+            for output in OUTPUTS:
+                if station['outputs'].get(output):
+                    self._by_output[output].append(station)
+
+    def __len__(self):
+        return len(self._stations)
+
+    def __iter__(self):
+        return iter(self._stations)
+
+    def __contains__(self, code):
+        return code in self._by_code
+
+    def get(self, code, default=None):
+        """Estació pel seu codi (o `default`)"""
+        return self._by_code.get(code, default)
+
+    def enabled(self):
+        """Totes les estacions actives"""
+        return [s for s in self._stations if s.get('enabled', True)]
+
+    def for_output(self, output):
+        """Estacions actives que alimenten una sortida ('rss', 'daily', 'html')"""
+        return list(self._by_output[output])
+
+    def html_file(self, code):
+        """Nom del fitxer HTML de pantalla completa de l'estació (o None)"""
+        station = self._by_code.get(code)
+        if not station or not station.get('enabled', True):
+            return None
+        return station['outputs'].get('html')
+
+
+def _merge(defaults, station):
+    """Aplica els valors per defecte a una estació"""
+    merged = copy.deepcopy(defaults)
+    for key, value in station.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key].update(value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def parse_registry(data):
+    """Construeix el registre a partir del contingut de stations.json"""
+    template = data.get('url_template', DEFAULT_URL_TEMPLATE)
+    defaults = data.get('defaults', {})
+    stations = []
+    for raw in data.get('stations', []):
+        station = _merge(defaults, raw)
+        station.setdefault('outputs', {})
+        station.setdefault('url', template.format(code=station['code']))
+        stations.append(station)
+    return StationRegistry(stations)
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def load_registry(filename=REGISTRY_FILE):
+    """Retorna el registre (cada fitxer es llegeix del disc una sola vegada)"""
+    with _registries_lock:
+        registry = _registries.get(filename)
+        if registry is None:
+            with open(filename, 'r', encoding='utf-8') as f:
+                registry = parse_registry(json.load(f))
+            _registries[filename] = registry
+        return registry
+
+
+def stations_for(output):
+    """Drecera: estacions actives d'una sortida del registre per defecte"""
+    return load_registry().for_output(output)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# station_stats.py - ESTADÍSTIQUES VECTORITZADES (NumPy)
+# Converteix els dies d'estació (StationDay) en matrius (dies × 48 períodes
+# semihoraris, NaN on falta la dada) i calcula totes les estadístiques d'un
+# cop per a tots els dies i estacions:
+#   - diàries: màxima, mínima i mitjana de temperatura, humitat mitjana,
+#     pluja total i intensitat màxima, direcció mitjana del vent (mitjana
+#     circular de dvm), ratxa màxima (vvx) i tendència de pressió a 3 hores
+#   - horàries: màxima, mínima i mitjana de temperatura, pluja i ratxa
+# No hi ha cap bucle per fila: només un per dia per col·locar les columnes.
+
+import numpy as np
+
+import derived_metrics
+import period_index
+
+# Períodes semihoraris per dia
+SLOTS = period_index.SLOTS
+
+# Tendència de pressió: diferència respecte de fa 3 hores (6 períodes)
+TENDENCY_SLOTS = 6
+
+_HOUR_LABELS = [f"{h:02d}:00" for h in range(24)]
+
+
+def to_matrices(days, fields):
+    """Matrius (dies × 48) dels `fields`: {camp: matriu}, NaN on falta la dada o el camp"""
+    matrices = {field: np.full((len(days), SLOTS), np.nan) for field in fields}
+    for row, day in enumerate(days):
+        if not len(day):
+            continue
+        # Índexs ja calculats en afegir cada període
+        slots = np.frombuffer(day.slots, dtype=np.int8)
+        for field in fields:
+            column = day.columns.get(field)
+            if column is not None:
+                matrices[field][row, slots] = np.frombuffer(column, dtype=np.float64)
+    return matrices
+
+
+def _mean(matrix, axis):
+    """Mitjana ignorant NaN (NaN si no hi ha cap valor), sense avisos"""
+    count = np.sum(~np.isnan(matrix), axis=axis)
+    total = np.nansum(matrix, axis=axis)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def _sum(matrix, axis):
+    """Suma ignorant NaN (NaN si no hi ha cap valor)"""
+    count = np.sum(~np.isnan(matrix), axis=axis)
+    return np.where(count > 0, np.nansum(matrix, axis=axis), np.nan)
+
+
+def _argext(matrix, func):
+    """Índex del màxim/mínim de cada fila (-1 si la fila és tota NaN)"""
+    empty = np.all(np.isnan(matrix), axis=1)
+    filled = np.where(np.isnan(matrix), -np.inf if func is np.argmax else np.inf, matrix)
+    return np.where(empty, -1, func(filled, axis=1))
+
+
+def circular_mean(degrees, axis):
+    """Direcció mitjana (graus 0-360) a partir dels vectors unitaris"""
+    radians = np.deg2rad(degrees)
+    sin = _mean(np.sin(radians), axis)
+    cos = _mean(np.cos(radians), axis)
+    return np.mod(np.rad2deg(np.arctan2(sin, cos)), 360.0)
+
+
+def pressure_tendency(pm):
+    """Diferència entre l'última pressió del dia i la de 3 hores abans"""
+    last = _last_index(~np.isnan(pm))
+    before = last - TENDENCY_SLOTS
+    rows = np.arange(pm.shape[0])
+    ok = before >= 0
+    tendency = np.full(pm.shape[0], np.nan)
+    tendency[ok] = pm[rows[ok], last[ok]] - pm[rows[ok], before[ok]]
+    return tendency
+
+
+def _last_index(valid):
+    """Índex de l'última posició vàlida de cada fila (-1 si no n'hi ha cap)"""
+    return np.where(valid.any(axis=1), valid.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1), -1)
+
+
+def _values(array, digits=1):
+    """Array → llista de floats arrodonits (None on hi ha NaN)"""
+    return [None if v != v else v for v in np.round(array, digits).tolist()]
+
+
+def _labels(slots, mask):
+    return [period_index.label(s) if ok else None for s, ok in zip(slots.tolist(), mask.tolist())]
+
+
+def daily_stats(days):
+    """Estadístiques diàries de cada StationDay (llista de diccionaris, en ordre)"""
+    if not days:
+        return []
+    m = to_matrices(days, ('tx', 'tn', 'tm', 'hr', 'ppt', 'vvm', 'dvm', 'vvx', 'pm'))
+
+    # Pluja en 30 minuts → mm/h
+    rain_intensity = np.fmax.reduce(m['ppt'], axis=1) * 2
+    rain_slot = _argext(m['ppt'], np.argmax)
+    gust_slot = _argext(m['vvx'], np.argmax)
+
+    columns = {
+        'temp_max': _values(np.fmax.reduce(m['tx'], axis=1)),
+        'temp_min': _values(np.fmin.reduce(m['tn'], axis=1)),
+        'temp_mean': _values(_mean(m['tm'], axis=1)),
+        'humidity_mean': _values(_mean(m['hr'], axis=1), 0),
+        'rain_total': _values(_sum(m['ppt'], axis=1)),
+        'rain_max_intensity': _values(rain_intensity),
+        'rain_max_intensity_period': _labels(rain_slot, (rain_slot >= 0) & (rain_intensity > 0)),
+        'wind_mean': _values(_mean(m['vvm'], axis=1)),
+        'wind_dir_mean': _values(circular_mean(m['dvm'], axis=1), 0),
+        'gust_max': _values(np.fmax.reduce(m['vvx'], axis=1)),
+        'gust_max_period': _labels(gust_slot, gust_slot >= 0),
+        'pressure_tendency_3h': _values(pressure_tendency(m['pm'])),
+    }
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def hourly_stats(days):
+    """Estadístiques per hora de cada StationDay: per dia, llista de les hores amb dades"""
+    if not days:
+        return []
+    # (dies × 24 hores × 2 períodes)
+    m = {field: matrix.reshape(len(days), 24, 2)
+         for field, matrix in to_matrices(days, ('tx', 'tn', 'tm', 'ppt', 'vvx')).items()}
+
+    # Totes les hores de tots els dies en una sola fila per a la conversió
+    columns = {
+        'hour': _HOUR_LABELS * len(days),
+        'temp_max': _values(np.fmax.reduce(m['tx'], axis=2).ravel()),
+        'temp_min': _values(np.fmin.reduce(m['tn'], axis=2).ravel()),
+        'temp_mean': _values(_mean(m['tm'], axis=2).ravel()),
+        'rain': _values(_sum(m['ppt'], axis=2).ravel()),
+        'gust_max': _values(np.fmax.reduce(m['vvx'], axis=2).ravel()),
+    }
+    has_data = ~np.all(np.isnan(np.concatenate([m['tx'], m['tn'], m['tm'], m['ppt']], axis=2)), axis=2)
+    keys = tuple(columns)
+    hours = [dict(zip(keys, values)) for values in zip(*columns.values())]
+    return [[hours[i * 24 + h] for h in range(24) if mask[h]]
+            for i, mask in enumerate(has_data.tolist())]
+
+
+def derived_stats(days):
+    """Magnituds derivades de cada StationDay: últim període i extrems del dia"""
+    if not days:
+        return []
+    m = to_matrices(days, ('tm', 'hr', 'vvm'))
+    derived = derived_metrics.compute(m['tm'], m['hr'], m['vvm'])
+    feels_like = derived['feels_like']
+
+    rows = np.arange(len(days))
+    last = _last_index(~np.isnan(feels_like))
+    has_last = last >= 0
+    at_last = np.where(has_last, last, 0)
+
+    def latest(matrix):
+        return np.where(has_last, matrix[rows, at_last], np.nan)
+
+    columns = {
+        'period': _labels(last, has_last),
+        'dew_point': _values(latest(derived['dew_point'])),
+        'feels_like': _values(latest(feels_like)),
+        'heat_index': _values(latest(derived['heat_index'])),
+        'wind_chill': _values(latest(derived['wind_chill'])),
+        'feels_like_max': _values(np.fmax.reduce(feels_like, axis=1)),
+        'feels_like_min': _values(np.fmin.reduce(feels_like, axis=1)),
+    }
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
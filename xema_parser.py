@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# xema_parser.py - PARSEIG DIRIGIT DE LA TAULA tblperiode
+# Només construïm la taula de dades de la pàgina XEMA (no tot el document).
+# Backends disponibles (tots retornen la mateixa estructura: una llista de
+# files, cada fila una llista amb el text net de cada cel·la td/th):
+#   - 'lxml':   lxml.html (C, el més ràpid) si està instal·lat
+#   - 'soup':   BeautifulSoup amb SoupStrainer (només l'arbre de la taula)
+#   - 'stdlib': html.parser de Python, sense dependències externes
+#   - 'auto':   lxml si està disponible, si no stdlib
+
+import importlib.util
+from html.parser import HTMLParser
+
+# lxml només s'importa quan es parseja la primera taula amb aquest backend
+HAS_LXML = importlib.util.find_spec('lxml') is not None
+
+TABLE_CLASS = 'tblperiode'
+
+BACKENDS = ('auto', 'lxml', 'soup', 'stdlib')
+DEFAULT_BACKEND = 'auto'
+
+
+def _to_text(content):
+    """Converteix el contingut de la resposta a text"""
+    if isinstance(content, str):
+        return content
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        return content.decode('cp1252', errors='replace')
+
+
+def _find_table_start(text):
+    """Posició de l'etiqueta <table ...> que té la classe tblperiode (o -1)"""
+    pos = text.find(TABLE_CLASS)
+    while pos != -1:
+        start = text.rfind('<table', 0, pos)
+        # La classe ha d'estar dins la mateixa etiqueta d'obertura
+        if start != -1 and '>' not in text[start:pos]:
+            return start
+        pos = text.find(TABLE_CLASS, pos + len(TABLE_CLASS))
+    return -1
+
+
+# ---------------------------------------------------------------------------
+# Backend lxml
+# ---------------------------------------------------------------------------
+
+def _parse_lxml(text):
+    import lxml.html
+
+    start = _find_table_start(text)
+    if start == -1:
+        return None
+    doc = lxml.html.fromstring(text[start:])
+    tables = doc.xpath(
+        f"descendant-or-self::table[contains(concat(' ', normalize-space(@class), ' '), ' {TABLE_CLASS} ')]"
+    )
+    if not tables:
+        return None
+    return [
+        [''.join(part.strip() for part in cell.itertext()) for cell in row.iter('td', 'th')]
+        for row in tables[0].iter('tr')
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Backend BeautifulSoup + SoupStrainer
+# ---------------------------------------------------------------------------
+
+def _parse_soup(text):
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    start = _find_table_start(text)
+    if start == -1:
+        return None
+    # Comencem a la taula i només construïm l'arbre de les <table>
+    strainer = SoupStrainer('table')
+    soup = BeautifulSoup(text[start:], 'lxml' if HAS_LXML else 'html.parser', parse_only=strainer)
+    table = soup.find('table', {'class': TABLE_CLASS})
+    if not table:
+        return None
+    return [
+        [cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])]
+        for row in table.find_all('tr')
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Backend stdlib (html.parser)
+# ---------------------------------------------------------------------------
+
+class _TableParser(HTMLParser):
+    """Recull les files i cel·les de la primera taula tblperiode
+
+    Les taules niuades dins la taula objectiu no obren files ni cel·les
+    noves: el seu text s'afegeix a la cel·la que les conté.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = None
+        self.done = False
+        self._depth = 0  # nivell de taules (1 = la taula objectiu)
+        self._row = None
+        self._cell = None
+
+    def _close_cell(self):
+        if self._cell is not None:
+            self._row.append(''.join(self._cell))
+            self._cell = None
+
+    def _close_row(self):
+        self._close_cell()
+        if self._row is not None:
+            self.rows.append(self._row)
+            self._row = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == 'table':
+            if self._depth == 0:
+                classes = (dict(attrs).get('class') or '').split()
+                if TABLE_CLASS not in classes:
+                    return
+                self.rows = []
+            self._depth += 1
+        elif self._depth != 1:
+            return
+        elif tag == 'tr':
+            # Un <tr> nou tanca la fila anterior (encara que falti </tr>)
+            self._close_row()
+            self._row = []
+        elif tag in ('td', 'th'):
+            self._close_cell()
+            if self._row is None:
+                self._row = []
+            self._cell = []
+
+    def handle_endtag(self, tag):
+        if self.done or self._depth == 0:
+            return
+        if tag == 'table':
+            self._depth -= 1
+            if self._depth == 0:
+                self._close_row()
+                self.done = True
+        elif self._depth != 1:
+            return
+        elif tag == 'tr':
+            self._close_row()
+        elif tag in ('td', 'th'):
+            self._close_cell()
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            data = data.strip()
+            if data:
+                self._cell.append(data)
+
+
+def _parse_stdlib(text, chunk_size=16 * 1024):
+    start = _find_table_start(text)
+    if start == -1:
+        return None
+    parser = _TableParser()
+    # Alimentem per blocs i parem tan bon punt es tanca la taula
+    for pos in range(start, len(text), chunk_size):
+        parser.feed(text[pos:pos + chunk_size])
+        if parser.done:
+            break
+    else:
+        parser.close()
+        if parser.rows is not None:
+            parser._close_row()
+    return parser.rows
+
+
+def _parse_fragment(fragment):
+    """Parseja un tros de taula (p. ex. una sola fila) amb el backend stdlib"""
+    parser = _TableParser()
+    parser.feed(f'<table class="{TABLE_CLASS}">{fragment}</table>')
+    parser.close()
+    return parser.rows or []
+
+
+def _find_tr(text, start, end, reverse=False):
+    """Posició de la propera (o anterior) etiqueta <tr> dins [start, end)"""
+    finder = text.rfind if reverse else text.find
+    pos = finder('<tr', start, end)
+    while pos != -1:
+        after = text[pos + 3:pos + 4]
+        if after in ('>', ' ', '\t', '\n', '\r', '/'):
+            return pos
+        pos = finder('<tr', start, pos) if reverse else finder('<tr', pos + 3, end)
+    return -1
+
+
+def _table_bounds(text):
+    """Inici i final (abans de </table>) de la taula tblperiode, o (-1, -1)"""
+    start = _find_table_start(text)
+    if start == -1:
+        return -1, -1
+    # La taula XEMA no té taules niuades: el primer </table> la tanca
+    end = text.find('</table', start)
+    return start, (len(text) if end == -1 else end)
+
+
+def parse_header(content):
+    """Retorna només la primera fila (capçalera) de la taula, o None"""
+    text = _to_text(content)
+    start, end = _table_bounds(text)
+    if start == -1:
+        return None
+    first = _find_tr(text, start, end)
+    if first == -1:
+        return []
+    second = _find_tr(text, first + 3, end)
+    rows = _parse_fragment(text[first:end if second == -1 else second])
+    return rows[0] if rows else []
+
+
+def iter_rows_reversed(content):
+    """
+    Genera les files de dades des del FINAL de la taula (sense la capçalera)
+
+    Cada fila es parseja només quan es demana, buscant les etiquetes <tr>
+    cap enrere al text de la taula; no es construeix mai la taula sencera.
+    """
+    text = _to_text(content)
+    start, end = _table_bounds(text)
+    if start == -1:
+        return
+    first = _find_tr(text, start, end)
+    if first == -1:
+        return
+    stop = end
+    pos = _find_tr(text, first + 3, stop, reverse=True)
+    while pos > first:
+        for row in reversed(_parse_fragment(text[pos:stop])):
+            yield row
+        stop = pos
+        pos = _find_tr(text, first + 3, stop, reverse=True)
+
+
+_PARSERS = {
+    'lxml': _parse_lxml,
+    'soup': _parse_soup,
+    'stdlib': _parse_stdlib,
+}
+
+
+def parse_table(content, backend=DEFAULT_BACKEND):
+    """
+    Retorna les files de la taula tblperiode (o None si no hi és)
+
+    Cada fila és una llista amb el text de les cel·les td/th, amb els
+    espais de cada tros de text eliminats (com get_text(strip=True)).
+    """
+    if backend == 'auto':
+        backend = 'lxml' if HAS_LXML else 'stdlib'
+    if backend not in _PARSERS:
+        raise ValueError(f"Backend de parseig desconegut: {backend} (opcions: {', '.join(BACKENDS)})")
+    if backend == 'lxml' and not HAS_LXML:
+        raise ValueError("El backend 'lxml' necessita el paquet lxml")
+    return _PARSERS[backend](_to_text(content))
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# xema_schema.py - ESQUEMA DE COLUMNES XEMA COMPILAT
+# La capçalera de la taula tblperiode es tradueix UNA vegada per format
+# (signatura = hash de la capçalera) a un esquema {camp: índex de columna}.
+# Els dos scrapers l'utilitzen per extreure cada fila com a valors numèrics
+# en una sola passada.
+
+import hashlib
+import threading
+
+# Camps coneguts, en l'ordre habitual de la taula XEMA
+FIELDS = ('tm', 'tx', 'tn', 'hr', 'ppt', 'gn', 'vvm', 'dvm', 'vvx', 'pm', 'rs')
+
+# Valors que indiquen "sense dades"
+NO_DATA = {'', '(s/d)', '-', 'n/d', 'N/D'}
+
+
+def to_number(text, default=None):
+    """Converteix text a número, retorna None si no és vàlid"""
+    if not text or text in NO_DATA:
+        return None
+    try:
+        # Netejar possibles símbols
+        text = text.replace(',', '.').replace('°', '').replace('mm', '').replace('hPa', '').replace('W/m²', '')
+        return float(text.strip())
+    except ValueError:
+        return None
+
+
+def match_field(col_name):
+    """Retorna la clau de dades d'una columna de la capçalera (o None)"""
+    col_name_lower = col_name.lower()
+
+    # Temperatura TM
+    if ('tm' in col_name_lower or 'mitjana' in col_name_lower) and ('°c' in col_name or 'c' in col_name_lower):
+        return 'tm'
+    # Temperatura TX
+    if ('tx' in col_name_lower or 'màxima' in col_name_lower or 'maxima' in col_name_lower) and ('°c' in col_name or 'c' in col_name_lower):
+        return 'tx'
+    # Temperatura TN
+    if ('tn' in col_name_lower or 'mínima' in col_name_lower or 'minima' in col_name_lower) and ('°c' in col_name or 'c' in col_name_lower):
+        return 'tn'
+    # Humitat
+    if ('hrm' in col_name_lower or 'hr' in col_name_lower or 'humitat' in col_name_lower or 'humidity' in col_name_lower) and ('%' in col_name):
+        return 'hr'
+    # Precipitació
+    if ('ppt' in col_name_lower or 'precipitació' in col_name_lower or 'precipitacio' in col_name_lower or
+            'pluja' in col_name_lower or 'precipitation' in col_name_lower) and ('mm' in col_name):
+        return 'ppt'
+    # Gruix de neu (GN)
+    if ('gn' in col_name_lower or 'neu' in col_name_lower or 'snow' in col_name_lower or 'gruix' in col_name_lower) and ('cm' in col_name):
+        return 'gn'
+    # Vent mitjà (VVM)
+    if ('vvm' in col_name_lower or ('vent' in col_name_lower and 'mitj' in col_name_lower) or
+            'wind' in col_name_lower) and ('km/h' in col_name or 'km' in col_name_lower):
+        return 'vvm'
+    # Direcció vent (DVM)
+    if ('dvm' in col_name_lower or 'direcció' in col_name_lower or 'direccio' in col_name_lower or
+            'direction' in col_name_lower) and ('graus' in col_name_lower or '°' in col_name or 'degrees' in col_name_lower):
+        return 'dvm'
+    # Vent màxim (VVX)
+    if ('vvx' in col_name_lower or ('vent' in col_name_lower and 'màx' in col_name_lower) or
+            'max' in col_name_lower) and ('km/h' in col_name or 'km' in col_name_lower):
+        return 'vvx'
+    # Pressió (PM)
+    if ('pm' in col_name_lower or 'pressió' in col_name_lower or 'pressio' in col_name_lower or
+            'pressure' in col_name_lower) and ('hpa' in col_name_lower or 'hpa' in col_name):
+        return 'pm'
+    # Radiació solar (RS)
+    if ('rs' in col_name_lower or 'radiació' in col_name_lower or 'radiacio' in col_name_lower or
+            'radiation' in col_name_lower) and ('w/m²' in col_name_lower or 'w/m2' in col_name_lower):
+        return 'rs'
+    return None
+
+
+def header_signature(header):
+    """Hash que identifica un format de capçalera"""
+    return hashlib.sha1('\x1f'.join(header).encode('utf-8')).hexdigest()
+
+
+class Schema:
+    """Esquema compilat d'una capçalera XEMA"""
+
+    def __init__(self, header):
+        self.header = tuple(header)
+        self.signature = header_signature(self.header)
+
+        columns = {}
+        for idx, col_name in enumerate(self.header):
+            # Període - sempre és la primera columna
+            if idx == 0:
+                columns['periode'] = idx
+                continue
+            field = match_field(col_name)
+            if field:
+                columns[field] = idx
+
+        # Si no hem trobat TM, suposem que és la segona columna si conté °C
+        if 'tm' not in columns and len(self.header) > 1 and '°c' in self.header[1]:
+            columns['tm'] = 1
+
+        # Mapeig camp → índex (inclou 'periode'), en l'ordre de la capçalera
+        self.columns = columns
+        # Parelles (camp, índex) de dades, sense el període
+        self.fields = tuple((k, v) for k, v in columns.items() if k != 'periode')
+
+    def extract(self, cells):
+        """Converteix una fila en {camp: valor numèric o None} (una sola passada)"""
+        n = len(cells)
+        return {field: to_number(cells[idx]) for field, idx in self.fields if idx < n}
+
+    def __repr__(self):
+        return f"Schema({self.columns})"
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def compile_schema(header):
+    """Retorna l'esquema de la capçalera (es compila una vegada per format)"""
+    signature = header_signature(header)
+    schema = _cache.get(signature)
+    if schema is None:
+        with _cache_lock:
+            schema = _cache.setdefault(signature, Schema(header))
+    return schema